@@ -0,0 +1,207 @@
+"""Times and memory-profiles learner training and querying on synthetic
+datasets shaped like Builder.build output. Runs fully offline.
+
+Usage:
+    python -m benchmarks.learners --rows 1000 10000 --features 8 --bags 1 20
+"""
+
+import argparse
+import json
+import platform
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+import numpy as np
+import pandas as pd
+from learners import BagLearner, DTLearner, RTLearner
+
+# Columns produced by Builder.build, besides the Signal target
+BUILDER_COLUMNS = [
+    "Open",
+    "High",
+    "Low",
+    "Close",
+    "Volume",
+    "DailyReturn",
+    "DailySharpeRatio",
+    "Sentiment",
+]
+
+# Trading days per synthetic ticker, larger datasets stack more tickers
+DAYS_PER_TICKER = 2520
+
+
+def synthetic_dataset(rows: int, features: int, seed: int = 0) -> pd.DataFrame:
+    """Generates a dataset shaped like Builder.build output, stacking tickers
+    of DAYS_PER_TICKER business days each, so dates repeat on large datasets.
+    Features beyond the Builder columns are random noise columns.
+
+    Args:
+        rows (int): Number of rows.
+        features (int): Number of feature columns.
+        seed (int): Seed of the random generator.
+
+    Returns:
+        pd.DataFrame: Date indexed features and an encoded Signal column.
+    """
+    rng = np.random.default_rng(seed)
+
+    days = pd.bdate_range("2000-01-03", periods=DAYS_PER_TICKER, name="Date")
+    index = days[np.arange(rows) % DAYS_PER_TICKER]
+
+    returns = rng.normal(0.05, 1.5, rows)
+    close = 100 * np.exp(np.cumsum(returns * 0.01))
+    spread = np.abs(rng.normal(0, 0.01, rows)) * close
+
+    columns = {
+        "Open": close + rng.normal(0, 0.005, rows) * close,
+        "High": close + spread,
+        "Low": close - spread,
+        "Close": close,
+        "Volume": rng.lognormal(15, 1, rows).round(),
+        "DailyReturn": returns,
+        "DailySharpeRatio": rng.normal(0.02, 0.05, rows),
+        "Sentiment": np.clip(rng.normal(0.2, 0.5, rows), -1, 1),
+    }
+
+    df = pd.DataFrame(
+        {name: columns[name] for name in BUILDER_COLUMNS[:features]}, index=index
+    )
+
+    for extra in range(features - len(df.columns)):
+        df[f"Noise{extra}"] = rng.normal(size=rows)
+
+    # Buy, Hold, Sell encoded as LabelEncoder would, loosely tied to sentiment
+    next_return = np.roll(returns, -1) + df.get("Sentiment", 0) * 0.5
+    df["Signal"] = np.where(next_return > 0.5, 0, np.where(next_return < -0.5, 2, 1))
+
+    return df
+
+
+def measure(function: Callable[[], Any]) -> Dict[str, float]:
+    """Runs a function twice, timing the first run and measuring peak traced
+    memory in the second, since tracing slows every allocation and would
+    inflate the timing.
+
+    Args:
+        function (Callable[[], Any]): The function to run.
+
+    Returns:
+        Dict[str, float]: Seconds taken and peak memory in megabytes.
+    """
+    start = time.perf_counter()
+    function()
+    seconds = time.perf_counter() - start
+
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"seconds": seconds, "peak_mb": peak / 2**20}
+
+
+def run(
+    rows: List[int],
+    features: List[int],
+    bags: List[int],
+    query_rows: int,
+    n_jobs: int,
+    seed: int,
+) -> List[Dict[str, Any]]:
+    """Benchmarks DTLearner, RTLearner and BagLearner over a grid of dataset sizes.
+
+    Args:
+        rows (List[int]): Training row counts.
+        features (List[int]): Feature counts.
+        bags (List[int]): Bag counts, used for BagLearner only.
+        query_rows (int): Maximum number of rows queried.
+        n_jobs (int): Worker processes used by BagLearner.
+        seed (int): Seed of the datasets and learners.
+
+    Returns:
+        List[Dict[str, Any]]: One record per learner, grid point and phase.
+        Memory is traced in this process only, so records of BagLearner
+        training with n_jobs above 1 are flagged as leaving out its workers.
+    """
+    results = []
+
+    for row_count in rows:
+        for feature_count in features:
+            df = synthetic_dataset(row_count, feature_count, seed)
+            dataY = df.pop("Signal")
+            queryX = df.iloc[:query_rows].to_numpy(dtype=float)
+
+            candidates: List[tuple[str, int, Any]] = [
+                ("DTLearner", 1, DTLearner(classifier=True, seed=seed)),
+                ("RTLearner", 1, RTLearner(classifier=True, seed=seed)),
+            ]
+            candidates += [
+                (
+                    "BagLearner",
+                    bag_count,
+                    BagLearner(RTLearner, bag_count, True, n_jobs=n_jobs, seed=seed),
+                )
+                for bag_count in bags
+            ]
+
+            for name, bag_count, learner in candidates:
+                for phase, function in [
+                    ("train", lambda: learner.add_evidence(df, dataY)),
+                    ("query", lambda: learner.query_matrix(queryX)),
+                ]:
+                    record = {
+                        "learner": name,
+                        "phase": phase,
+                        "rows": row_count if phase == "train" else len(queryX),
+                        "features": feature_count,
+                        "bags": bag_count,
+                        **measure(function),
+                        "peak_mb_excludes_workers": name == "BagLearner"
+                        and phase == "train"
+                        and n_jobs > 1,
+                    }
+                    print(json.dumps(record))
+                    results.append(record)
+
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--features", type=int, nargs="+", default=[8])
+    parser.add_argument("--bags", type=int, nargs="+", default=[10, 50])
+    parser.add_argument("--query-rows", type=int, default=100000)
+    parser.add_argument("--n-jobs", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--output", default="bench_output.json", help="Path of the JSON results."
+    )
+    args = parser.parse_args()
+
+    results = run(
+        args.rows, args.features, args.bags, args.query_rows, args.n_jobs, args.seed
+    )
+
+    with open(args.output, "w") as file:
+        json.dump(
+            {
+                "created": datetime.now().isoformat(),
+                "python": platform.python_version(),
+                "numpy": np.__version__,
+                "pandas": pd.__version__,
+                "machine": platform.machine(),
+                "arguments": vars(args),
+                "results": results,
+            },
+            file,
+            indent=2,
+        )
+
+    print(f"[BENCHMARK] RESULTS SAVED TO {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,15 @@
-from financialcalc.returns import BuySellHold, DailyReturn
+from financialcalc.returns import BuySellHold, DailyReturn, SignalColumn
 from financialcalc.ratios import DailySharpeRatio
+from godel.cache import NewsCache
+from godel.fetcher import ArticleFetcher
 from godel.godel import Godel
+from godel.store import ArticleStore
 from sentiment.analyzer import create_sentiment_column
-from stooq import Stooq
+from stooq import PriceCache, Stooq
 from datetime import datetime
+from typing import List
+import numpy as np
 import pandas as pd
-from multiprocessing.pool import ThreadPool
 
 
 class Builder:
@@ -14,7 +18,12 @@ class Builder:
 
     @staticmethod
     def build(
-        ticker: str, startDate: str, endDate: str, threshold: float, threads: int = 250
+        ticker: str,
+        startDate: str,
+        endDate: str,
+        threshold: float | List[float],
+        threads: int = 250,
+        cache: bool = True,
     ) -> pd.DataFrame:
         """Takes in a ticker, start and end dates, and builds
         a complete dataset, including financial statistics and
@@ -28,8 +37,12 @@ class Builder:
             endDate (str): The cutoff date to stop looking for data.
             threshold (float): Threshold for a Daily Return Percent to be
                             considered a BUY, SELL, or HOLD. Must be a
-                            positive floating point number.
-            threads (int): Number of threads to use when pulling article text, defaults to 250.
+                            positive floating point number. Given a list of
+                            thresholds, one label column is built for each,
+                            such as Signal_0.5 and Signal_1.0.
+            threads (int): Number of articles pulled at once, and of threads used
+                            for sentiment analysis, defaults to 250.
+            cache (bool): Whether to read and save data in the local cache, defaults to True.
 
         Returns:
             pd.DataFrame: The DataFrame representing the stock dataset.
@@ -39,7 +52,10 @@ class Builder:
         end_date = datetime.strptime(endDate, "%m-%d-%Y")
 
         stock_df = Stooq.download(
-            ticker, start_date.strftime("%Y%m%d"), end_date.strftime("%Y%m%d")
+            ticker,
+            start_date.strftime("%Y%m%d"),
+            end_date.strftime("%Y%m%d"),
+            PriceCache() if cache else None,
         )
 
         if len(stock_df) == 0:
@@ -53,9 +69,13 @@ class Builder:
         stock_df = BuySellHold(stock_df, threshold)
         stock_df = DailySharpeRatio(stock_df)
 
+        signal_columns = ["Signal"]
+        if np.ndim(threshold) != 0:
+            signal_columns = [SignalColumn(value) for value in threshold]
+
         if any(
             col not in stock_df.columns
-            for col in ["DailyReturn", "Signal", "DailySharpeRatio"]
+            for col in ["DailyReturn", "DailySharpeRatio", *signal_columns]
         ):
             raise ValueError(
                 f"A financial statistic calculation didn't work for ticker: {ticker}."
@@ -65,8 +85,11 @@ class Builder:
         # Checkpoint: Financial Statistics Calculated
         #             and added to DataFrame.
 
-        articles_obj = Godel.queryNews(
-            [ticker], start_date.strftime("%m-%d-%Y"), end_date.strftime("%m-%d-%Y")
+        articles_obj = Godel.queryNewsSharded(
+            [ticker],
+            start_date.strftime("%m-%d-%Y"),
+            end_date.strftime("%m-%d-%Y"),
+            cache=NewsCache() if cache else None,
         )
 
         articles_obj = articles_obj[ticker]
@@ -80,13 +103,18 @@ class Builder:
 
         # Checkpoint: Articles pulled for given ticker.
 
-        pool = ThreadPool(threads)
+        store = ArticleStore() if cache else None
+
+        fetcher = ArticleFetcher(concurrency=threads, store=store)
+        counts = fetcher.fetch(
+            [article for articles in articles_obj.values() for article in articles]
+        )
 
-        for _, articles in articles_obj.items():
-            for article in articles:
-                pool.apply_async(article.pullArticle, args=())
-        pool.close()
-        pool.join()
+        print(
+            f"[BUILDER] {ticker} ARTICLES FETCHED: {counts['fetched']}, "
+            f"FROM STORE: {counts['stored']}, FAILED: {counts['failed']}, "
+            f"RETRIES: {counts['retried']}"
+        )
 
         # Filters articles where text could not be retrieved
 
@@ -1,2 +1,9 @@
-from .returns import DailyReturn, BuySellHold
-from .ratios import DailySharpeRatio
+from .returns import (
+    DailyReturn,
+    BuySellHold,
+    DailyReturnPanel,
+    BuySellHoldPanel,
+    SignalColumn,
+)
+from .ratios import DailySharpeRatio, ExpandingSharpeRatio, DailySharpeRatioPanel
+from .rolling import RollingFeatureEngine, RollingFeatures
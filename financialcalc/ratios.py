@@ -1,26 +1,132 @@
-from typing import cast
+import numpy as np
 import pandas as pd
 from .constants import DAILY_RISK_FREE_RATE
 
 
-def DailySharpeRatio(stockDF: pd.DataFrame) -> pd.DataFrame:
-    stockDF["DailySharpeRatio"] = 0
+def ExpandingSharpeRatio(dailyReturns: np.ndarray) -> np.ndarray:
+    """Calculates the Sharpe ratio of every prefix of a series of daily
+    returns in a single pass, using running sums instead of recomputing
+    the mean and standard deviation of each prefix. NaN returns are
+    skipped, as pandas does.
+
+    Args:
+        dailyReturns (np.ndarray): Daily returns as percentages, oldest first.
+
+    Returns:
+        np.ndarray: The Sharpe ratio of the returns up to and including each day.
+    """
+    returns = np.asarray(dailyReturns, dtype=float) * 0.01
+
+    valid = ~np.isnan(returns)
+
+    # Running sums are taken around the first return, which keeps
+    # them small and avoids cancellation in the variance
+    shift = returns[valid][0] if valid.any() else 0.0
+    centered = np.where(valid, returns - shift, 0.0)
+
+    return _SharpeFromRunningSums(
+        np.cumsum(valid), np.cumsum(centered), np.cumsum(centered**2), shift
+    )
+
 
-    stockDF = stockDF.reset_index()
+def _SharpeFromRunningSums(
+    count: np.ndarray,
+    total: np.ndarray,
+    total_squared: np.ndarray,
+    shift: np.ndarray | float,
+) -> np.ndarray:
+    """Calculates Sharpe ratios from running counts, sums and sums of
+    squares of returns taken around a shift.
 
-    for i, _ in stockDF.iterrows():
-        i = cast(int, i)
-        nextIndex = i + 1
-        subset = stockDF.iloc[0:nextIndex]
-        average_daily_return = (subset["DailyReturn"] * 0.01).mean()
-        average_volatility = (subset["DailyReturn"] * 0.01).std()
+    Args:
+        count (np.ndarray): Number of returns so far.
+        total (np.ndarray): Running sum of the shifted returns.
+        total_squared (np.ndarray): Running sum of the squared shifted returns.
+        shift (np.ndarray | float): The value subtracted from the returns.
 
-        sharpe_ratio = (
-            average_daily_return - DAILY_RISK_FREE_RATE
-        ) / average_volatility
+    Returns:
+        np.ndarray: The Sharpe ratio of the returns so far.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        average_daily_return = total / count + shift
+        variance = (total_squared - total**2 / count) / (count - 1)
+        average_volatility = np.sqrt(np.maximum(variance, 0.0))
 
-        stockDF.loc[i, "DailySharpeRatio"] = sharpe_ratio
+        return (average_daily_return - DAILY_RISK_FREE_RATE) / average_volatility
 
-    stockDF = stockDF.set_index("Date")
+
+def DailySharpeRatio(stockDF: pd.DataFrame) -> pd.DataFrame:
+    """Creates a new column called DailySharpeRatio, holding the Sharpe
+    ratio of all daily returns up to and including each day.
+
+    Args:
+        stockDF (pd.DataFrame): The DataFrame representing the stocks historical performance,
+                                including the DailyReturn column.
+
+    Returns:
+        pd.DataFrame: The amended DataFrame containing the DailySharpeRatio column.
+    """
+    stockDF["DailySharpeRatio"] = ExpandingSharpeRatio(
+        stockDF["DailyReturn"].to_numpy(dtype=float)
+    )
 
     return stockDF
+
+
+def _GroupedCumsum(
+    values: np.ndarray, groups: np.ndarray, positions: np.ndarray
+) -> np.ndarray:
+    """Calculates the running sum of values within each group. Values are laid
+    out in a (position, group) grid and summed down its columns, which adds them
+    in the same order as np.cumsum on each group alone, so results are identical.
+
+    Args:
+        values (np.ndarray): The values to sum.
+        groups (np.ndarray): Group number of each value.
+        positions (np.ndarray): Position of each value within its group.
+
+    Returns:
+        np.ndarray: The running sum of each value's group up to and including it.
+    """
+    if len(values) == 0:
+        return np.zeros(0)
+
+    grid = np.zeros((positions.max() + 1, groups.max() + 1))
+    grid[positions, groups] = values
+
+    return np.cumsum(grid, axis=0)[positions, groups]
+
+
+def DailySharpeRatioPanel(panelDF: pd.DataFrame) -> pd.DataFrame:
+    """Panel version of DailySharpeRatio, computing the DailySharpeRatio
+    column for every ticker of a long DataFrame in one grouped pass.
+    Matches DailySharpeRatio applied to each ticker separately.
+
+    Args:
+        panelDF (pd.DataFrame): Historical performance of many stocks, indexed by (Date, Ticker),
+                                including the DailyReturn column.
+
+    Returns:
+        pd.DataFrame: The amended DataFrame containing the DailySharpeRatio column, sorted by date.
+    """
+    panelDF = panelDF.sort_index()
+
+    returns = panelDF["DailyReturn"].astype(float) * 0.01
+    valid = returns.notna()
+
+    # Each ticker's sums are taken around its own first return
+    shift = returns.groupby(level="Ticker", sort=False).transform("first").fillna(0.0)
+    centered = (returns - shift).where(valid, 0.0)
+
+    tickers = panelDF.groupby(level="Ticker", sort=False)
+    groups = tickers.ngroup().to_numpy()
+    positions = tickers.cumcount().to_numpy()
+
+    panelDF["DailySharpeRatio"] = _SharpeFromRunningSums(
+        valid.groupby(level="Ticker", sort=False).cumsum().to_numpy(),
+        _GroupedCumsum(centered.to_numpy(), groups, positions),
+        _GroupedCumsum(centered.to_numpy() ** 2, groups, positions),
+        shift.to_numpy(),
+    )
+
+    return panelDF
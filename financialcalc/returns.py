@@ -1,6 +1,52 @@
+from typing import List
+import numpy as np
 import pandas as pd
 
 
+def SignalColumn(threshold: float) -> str:
+    """Names the Signal column of a threshold, when building labels for
+    many thresholds at once. Example: 0.5 -> Signal_0.5
+
+    Args:
+        threshold (float): The threshold.
+
+    Returns:
+        str: The column's name.
+    """
+    return f"Signal_{float(threshold)}"
+
+
+def _AssignSignals(
+    stockDF: pd.DataFrame, nextReturn: np.ndarray, threshold: float | List[float]
+) -> None:
+    """Labels every row as a buy, sell, or hold for each threshold at once,
+    into Signal for a single threshold or SignalColumn(threshold) for a list.
+
+    Args:
+        stockDF (pd.DataFrame): The DataFrame to add the columns to.
+        nextReturn (np.ndarray): Each row's next daily return percent.
+        threshold (float | List[float]): One or many thresholds.
+
+    Returns:
+        None
+    """
+    thresholds = np.atleast_1d(np.asarray(threshold, dtype=float))
+
+    upcoming = nextReturn[:, None]
+
+    # A missing next return compares false both ways, signaling a hold
+    signals = np.where(
+        upcoming > thresholds, "B", np.where(upcoming < (-1 * thresholds), "S", "H")
+    ).astype(object)
+
+    if np.ndim(threshold) == 0:
+        stockDF["Signal"] = signals[:, 0]
+        return
+
+    for index, value in enumerate(thresholds):
+        stockDF[SignalColumn(value)] = signals[:, index]
+
+
 def DailyReturn(stockDF: pd.DataFrame) -> pd.DataFrame:
     """Creates a new column called DailyReturn, to calculate
     the return for each day, or row of the column, from previous
@@ -23,7 +69,7 @@ def DailyReturn(stockDF: pd.DataFrame) -> pd.DataFrame:
     return stockDF
 
 
-def BuySellHold(stockDF: pd.DataFrame, threshold: float) -> pd.DataFrame:
+def BuySellHold(stockDF: pd.DataFrame, threshold: float | List[float]) -> pd.DataFrame:
     """Creates a new column called Signal, to determine whether the proper
     decision (when looking at the next day's close price) was to buy, sell,
     or hold, depending on the movement in price, as a percentage, with a
@@ -31,21 +77,70 @@ def BuySellHold(stockDF: pd.DataFrame, threshold: float) -> pd.DataFrame:
     If the next days daily return is greater than the threshold, it signals
     a buy (B). If the next days daily return is less than the threshold times
     negative 1, it signals a sell (S). Otherwise, it signals a hold (H).
+    Given a list of thresholds, one column is created for each, named by
+    SignalColumn, for example Signal_0.5 and Signal_1.0.
 
     Args:
         stockDF (pd.DataFrame): The DataFrame representing the stocks historical performance.
+        threshold (float | List[float]): One threshold, or a list of thresholds.
 
     Returns:
-        pd.DataFrame: The amended DataFrame containing the Signal column.
+        pd.DataFrame: The amended DataFrame containing the Signal column(s).
     """
-    stockDF["Signal"] = (
-        stockDF["DailyReturn"]
-        .shift(-1)
-        .apply(
-            lambda x: "B" if x > threshold else ("S" if x < (-1 * threshold) else "H")
-        )
+    _AssignSignals(
+        stockDF, stockDF["DailyReturn"].shift(-1).to_numpy(dtype=float), threshold
     )
 
     stockDF = stockDF.dropna(how="any")
 
     return stockDF
+
+
+def DailyReturnPanel(panelDF: pd.DataFrame) -> pd.DataFrame:
+    """Panel version of DailyReturn, computing the DailyReturn column for
+    every ticker of a long DataFrame at once. Matches DailyReturn applied
+    to each ticker separately.
+
+    Args:
+        panelDF (pd.DataFrame): Historical performance of many stocks, indexed by (Date, Ticker).
+
+    Returns:
+        pd.DataFrame: The amended DataFrame containing the DailyReturn column, sorted by date.
+    """
+    panelDF = panelDF.sort_index()
+
+    previousClose = panelDF.groupby(level="Ticker", sort=False)["Close"].shift(1)
+
+    # Calculate Daily Return As A Percentage
+    panelDF["DailyReturn"] = (panelDF["Close"] - previousClose) / previousClose * 100
+
+    panelDF = panelDF.dropna(how="any")
+
+    return panelDF
+
+
+def BuySellHoldPanel(
+    panelDF: pd.DataFrame, threshold: float | List[float]
+) -> pd.DataFrame:
+    """Panel version of BuySellHold, computing the Signal column(s) for every
+    ticker of a long DataFrame at once. Matches BuySellHold applied to each
+    ticker separately, including a ticker's last day signaling a hold.
+
+    Args:
+        panelDF (pd.DataFrame): Historical performance of many stocks, indexed by (Date, Ticker),
+                                including the DailyReturn column.
+        threshold (float | List[float]): Threshold for a Daily Return Percent to be
+                                         considered a BUY, SELL, or HOLD, or a list of them.
+
+    Returns:
+        pd.DataFrame: The amended DataFrame containing the Signal column(s), sorted by date.
+    """
+    panelDF = panelDF.sort_index()
+
+    nextReturn = panelDF.groupby(level="Ticker", sort=False)["DailyReturn"].shift(-1)
+
+    _AssignSignals(panelDF, nextReturn.to_numpy(dtype=float), threshold)
+
+    panelDF = panelDF.dropna(how="any")
+
+    return panelDF
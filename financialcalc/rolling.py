@@ -0,0 +1,218 @@
+import math
+from collections import deque
+from typing import Dict
+import numpy as np
+import pandas as pd
+from .constants import DAILY_RISK_FREE_RATE
+
+# Columns produced by RollingFeatures and RollingFeatureEngine
+ROLLING_COLUMNS = [
+    "RollingReturn",
+    "RollingVolatility",
+    "RollingSharpeRatio",
+    "Momentum",
+    "VolumeZScore",
+]
+
+
+class RollingWindow:
+    def __init__(self, window: int):
+        """Keeps the mean and variance of the last window values, updated
+        in constant time as values arrive. The sums are recomputed from the
+        window every window updates, which stops rounding errors from
+        accumulating while keeping updates constant time on average.
+
+        Args:
+            window (int): Number of values in the window.
+
+        Returns:
+            None
+        """
+        self.window = window
+        self.values: deque[float] = deque(maxlen=window)
+        self.mean = 0.0
+        self.squaredDeviations = 0.0
+        self.updatesSinceResync = 0
+
+    def add(self, value: float) -> None:
+        """Adds a value, dropping the oldest one once the window is full.
+
+        Args:
+            value (float): The new value.
+
+        Returns:
+            None
+        """
+        if len(self.values) == self.window:
+            oldest = self.values[0]
+            self.values.append(value)
+
+            previousMean = self.mean
+            self.mean += (value - oldest) / self.window
+            self.squaredDeviations += (value - oldest) * (
+                value - self.mean + oldest - previousMean
+            )
+        else:
+            self.values.append(value)
+
+            delta = value - self.mean
+            self.mean += delta / len(self.values)
+            self.squaredDeviations += delta * (value - self.mean)
+
+        self.updatesSinceResync += 1
+
+        if self.updatesSinceResync >= self.window:
+            self.resync()
+
+    def resync(self) -> None:
+        """Recomputes the mean and squared deviations from the window's values.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        values = np.fromiter(self.values, dtype=float, count=len(self.values))
+        self.mean = float(values.mean()) if len(values) > 0 else 0.0
+        self.squaredDeviations = float(((values - self.mean) ** 2).sum())
+        self.updatesSinceResync = 0
+
+    @property
+    def full(self) -> bool:
+        """Whether the window holds window values."""
+        return len(self.values) == self.window
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation of the window's values."""
+        if len(self.values) < 2:
+            return math.nan
+        return math.sqrt(max(self.squaredDeviations, 0.0) / (len(self.values) - 1))
+
+
+class RollingFeatureEngine:
+    def __init__(self, window: int = 20):
+        """Keeps rolling feature state for each ticker and updates it in
+        constant time per bar, producing the same columns as RollingFeatures.
+        Feeding a ticker its last window + 1 historical bars is enough to
+        continue a dataset without recomputing its history.
+
+        Args:
+            window (int): Number of bars in each rolling window.
+
+        Returns:
+            None
+        """
+        self.window = window
+        self.closes: Dict[str, deque[float]] = {}
+        self.returns: Dict[str, RollingWindow] = {}
+        self.volumes: Dict[str, RollingWindow] = {}
+
+    def update(self, ticker: str, close: float, volume: float) -> Dict[str, float]:
+        """Adds a ticker's newest bar and returns its rolling features.
+        Features are NaN until enough bars have arrived to fill their window.
+
+        Args:
+            ticker (str): The ticker the bar belongs to.
+            close (float): The bar's close price.
+            volume (float): The bar's volume.
+
+        Returns:
+            Dict[str, float]: The bar's value for each of ROLLING_COLUMNS.
+        """
+        if ticker not in self.closes:
+            self.closes[ticker] = deque(maxlen=self.window + 1)
+            self.returns[ticker] = RollingWindow(self.window)
+            self.volumes[ticker] = RollingWindow(self.window)
+
+        closes = self.closes[ticker]
+        returns = self.returns[ticker]
+        volumes = self.volumes[ticker]
+
+        if len(closes) > 0:
+            returns.add((close - closes[-1]) / closes[-1])
+
+        closes.append(close)
+        volumes.add(volume)
+
+        features = {column: math.nan for column in ROLLING_COLUMNS}
+
+        if len(closes) == closes.maxlen:
+            features["RollingReturn"] = (close / closes[0] - 1) * 100
+            features["Momentum"] = close - closes[0]
+
+        if returns.full:
+            volatility = returns.std
+            features["RollingVolatility"] = volatility
+            features["RollingSharpeRatio"] = _Divide(
+                returns.mean - DAILY_RISK_FREE_RATE, volatility
+            )
+
+        if volumes.full:
+            features["VolumeZScore"] = _Divide(volume - volumes.mean, volumes.std)
+
+        return features
+
+    def updateFrame(self, ticker: str, stockDF: pd.DataFrame) -> pd.DataFrame:
+        """Adds a ticker's new bars in order and appends their rolling features.
+
+        Args:
+            ticker (str): The ticker the bars belong to.
+            stockDF (pd.DataFrame): The new bars, oldest first, with Close and Volume columns.
+
+        Returns:
+            pd.DataFrame: The amended DataFrame containing the rolling feature columns.
+        """
+        features = [
+            self.update(ticker, close, volume)
+            for close, volume in zip(
+                stockDF["Close"].to_numpy(dtype=float),
+                stockDF["Volume"].to_numpy(dtype=float),
+            )
+        ]
+
+        for column in ROLLING_COLUMNS:
+            stockDF[column] = [bar[column] for bar in features]
+
+        return stockDF
+
+
+def _Divide(numerator: float, denominator: float) -> float:
+    """Divides like NumPy, giving inf or NaN instead of raising on zero."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return float(np.float64(numerator) / np.float64(denominator))
+
+
+def RollingFeatures(stockDF: pd.DataFrame, window: int = 20) -> pd.DataFrame:
+    """Creates rolling feature columns over the whole DataFrame at once:
+    RollingReturn, the percent change in close over the window;
+    RollingVolatility, the standard deviation of the window's daily returns;
+    RollingSharpeRatio, the Sharpe ratio of the window's daily returns;
+    Momentum, the change in close over the window;
+    VolumeZScore, the volume's z-score within the window.
+    Matches RollingFeatureEngine fed the same bars, up to rounding.
+
+    Args:
+        stockDF (pd.DataFrame): The DataFrame representing the stocks historical performance.
+        window (int): Number of bars in each rolling window.
+
+    Returns:
+        pd.DataFrame: The amended DataFrame containing the rolling feature columns.
+    """
+    close = stockDF["Close"].astype(float)
+    volume = stockDF["Volume"].astype(float)
+
+    dailyReturn = (close - close.shift(1)) / close.shift(1)
+    returns = dailyReturn.rolling(window)
+    volumes = volume.rolling(window)
+
+    stockDF["RollingReturn"] = (close / close.shift(window) - 1) * 100
+    stockDF["RollingVolatility"] = returns.std()
+    stockDF["RollingSharpeRatio"] = (returns.mean() - DAILY_RISK_FREE_RATE) / stockDF[
+        "RollingVolatility"
+    ]
+    stockDF["Momentum"] = close - close.shift(window)
+    stockDF["VolumeZScore"] = (volume - volumes.mean()) / volumes.std()
+
+    return stockDF
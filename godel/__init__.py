@@ -1,3 +1,6 @@
 from .godel import Godel
 from .article import Article
 from .utility import articleSerializer
+from .cache import NewsCache
+from .store import ArticleStore
+from .fetcher import ArticleFetcher
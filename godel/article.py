@@ -1,5 +1,7 @@
 import requests
+from typing import cast
 from lxml import etree
+from godel.store import ArticleStore
 
 
 class Article:
@@ -48,13 +50,14 @@ class Article:
         """
         return f"Article(ticker={self.ticker}, title={self.title}, key={self.key}, providerName={self.providerName})"
 
-    def pullArticle(self) -> etree._Element | None:
+    def pullArticle(self, store: ArticleStore | None = None) -> etree._Element | None:
         """Fetches the article's content using its key,
         parses it using etree, from lxml, and returns
         the root object.
 
         Args:
-            None
+            store (ArticleStore | None): If given, the content is read from the
+            store when it has it, and saved to it after being fetched otherwise.
 
         Returns:
             etree._Element | None: Returns None if there is an error
@@ -65,17 +68,80 @@ class Article:
             return self.xmlArticle
 
         try:
-            response = requests.get(
-                f"https://api.godelterminal.com/api/news/content/{self.key}"
-            )
+            if store is not None:
+                body = store.get(self.key)
+                if Article.isValidContent(body):
+                    return self.setContent(cast(str, body))
 
-            if response.status_code != 200:
+            body = Article.downloadContent(self.key)
+
+            if body is None:
                 return None
 
-            root = etree.fromstring(response.text)
+            # Bodies are only stored once they parse, so a bad response is fetched again next time
+            root = self.setContent(body)
+
+            if store is not None:
+                store.put(self.key, body)
 
-            self.xmlArticle = root
-            self.articleText = " ".join(root.xpath(".//nitf/body//text()")).strip()
             return root
         except:
             return None
+
+    def setContent(self, body: str) -> etree._Element:
+        """Parses the article's content and stores the root object
+        and the article's text.
+
+        Args:
+            body (str): The content's XML.
+
+        Returns:
+            etree._Element: The root object.
+        """
+        root = etree.fromstring(body)
+
+        self.xmlArticle = root
+        self.articleText = " ".join(root.xpath(".//nitf/body//text()")).strip()
+        return root
+
+    @staticmethod
+    def isValidContent(body: str | None) -> bool:
+        """Checks that an article's content parses as XML.
+
+        Args:
+            body (str | None): The content's XML.
+
+        Returns:
+            bool: True if the content parses.
+        """
+        if body is None:
+            return False
+
+        try:
+            etree.fromstring(body)
+        except (ValueError, SyntaxError):
+            return False
+
+        return True
+
+    @staticmethod
+    def downloadContent(key: str) -> str | None:
+        """Downloads the content of an article.
+
+        Args:
+            key (str): Unique identifier of the article.
+
+        Returns:
+            str | None: The content's XML, None if it couldn't be fetched.
+        """
+        try:
+            response = requests.get(
+                f"https://api.godelterminal.com/api/news/content/{key}"
+            )
+        except requests.RequestException:
+            return None
+
+        if response.status_code != 200:
+            return None
+
+        return response.text
@@ -0,0 +1,100 @@
+from contextlib import closing
+from datetime import date
+from typing import Dict, List
+from godel.article import Article
+from localcache import CoverageCache
+
+
+class NewsCache(CoverageCache):
+    keyColumn = "ticker"
+
+    def __init__(self, path: str | None = None):
+        """Opens (creating if needed) an SQLite cache of Godel news listings,
+        keyed by ticker and publication day, along with the days each ticker's
+        listings have been fetched for.
+
+        Args:
+            path (str | None): Path of the SQLite file, defaults to news.sqlite in CACHE_DIR.
+
+        Returns:
+            None
+        """
+        super().__init__(
+            path,
+            "news.sqlite",
+            """
+            CREATE TABLE IF NOT EXISTS listings (
+                ticker TEXT NOT NULL,
+                key TEXT NOT NULL,
+                day TEXT NOT NULL,
+                providerName TEXT,
+                publicationTime TEXT NOT NULL,
+                title TEXT,
+                description TEXT,
+                PRIMARY KEY (ticker, key)
+            );
+            CREATE INDEX IF NOT EXISTS listings_day ON listings (ticker, day);
+            """,
+        )
+
+    def store(
+        self, ticker: str, articles: List[Article], startDate: date, endDate: date
+    ) -> None:
+        """Saves a ticker's listings fetched for the days from startDate up to
+        but not including endDate, and marks those days as fetched.
+
+        Args:
+            ticker (str): The ticker.
+            articles (List[Article]): The ticker's listings.
+            startDate (date): First day fetched.
+            endDate (date): Day after the last day fetched.
+
+        Returns:
+            None
+        """
+        rows = [
+            (
+                ticker,
+                article.key,
+                article.publicationTime[:10],
+                article.providerName,
+                article.publicationTime,
+                article.title,
+                article.description,
+            )
+            for article in articles
+        ]
+
+        with self.transaction() as connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO listings VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            self.markCovered(connection, ticker, startDate, endDate)
+
+    def load(
+        self, ticker: str, startDate: date, endDate: date
+    ) -> Dict[str, List[Article]]:
+        """Reads a ticker's cached listings from startDate up to but not including endDate.
+
+        Args:
+            ticker (str): The ticker.
+            startDate (date): First day to read.
+            endDate (date): Day after the last day to read.
+
+        Returns:
+            Dict[str, List[Article]]: Publication days, example: 2023-10-12,
+            mapping to the Articles published on them.
+        """
+        with closing(self.connect()) as connection:
+            rows = connection.execute(
+                "SELECT day, providerName, key, publicationTime, title, description"
+                " FROM listings WHERE ticker = ? AND day >= ? AND day < ?"
+                " ORDER BY day, rowid",
+                (ticker, startDate.isoformat(), endDate.isoformat()),
+            ).fetchall()
+
+        listings: Dict[str, List[Article]] = {}
+        for day, *fields in rows:
+            listings.setdefault(day, []).append(Article(ticker, *fields))
+
+        return listings
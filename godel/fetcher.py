@@ -0,0 +1,224 @@
+import asyncio
+import random
+import time
+from typing import Dict, List
+import aiohttp
+from godel.article import Article
+from godel.store import ArticleStore
+
+CONTENT_URL = "https://api.godelterminal.com/api/news/content/{key}"
+
+# Responses worth retrying, the server is overloaded or asking us to slow down
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Responses where the server pushes back, and fewer requests should be in flight
+THROTTLE_STATUSES = {429, 503}
+
+
+class ArticleFetcher:
+    def __init__(
+        self,
+        concurrency: int = 64,
+        retries: int = 5,
+        backoff: float = 0.5,
+        maxBackoff: float = 30.0,
+        timeout: float = 30.0,
+        store: ArticleStore | None = None,
+        batchSize: int = 500,
+    ):
+        """Constructs a fetcher that pulls the content of many articles
+        concurrently over keep-alive connections. Failed requests are retried
+        with exponential backoff and jitter, and the number of requests in
+        flight is halved whenever the server pushes back, then grown again
+        one request at a time as requests succeed.
+
+        Args:
+            concurrency (int): Maximum number of requests in flight, defaults to 64.
+            retries (int): Number of times a failed request is retried, defaults to 5.
+            backoff (float): Base delay in seconds before the first retry, defaults to 0.5.
+            maxBackoff (float): Maximum delay in seconds between retries, defaults to 30.
+            timeout (float): Timeout in seconds of each request, defaults to 30.
+            store (ArticleStore | None): If given, content is read from the store
+            when it has it, and saved to it after being fetched otherwise.
+            batchSize (int): Number of fetched bodies saved to the store in each
+            transaction, defaults to 500.
+
+        Returns:
+            None
+        """
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.maxBackoff = maxBackoff
+        self.timeout = timeout
+        self.store = store
+        self.batchSize = batchSize
+
+        self.fetched = 0
+        self.stored = 0
+        self.failed = 0
+        self.retried = 0
+
+    def fetch(self, articles: List[Article]) -> Dict[str, int]:
+        """Pulls the content of the given articles, setting their xmlArticle
+        and articleText. Articles sharing a key are fetched once.
+
+        Args:
+            articles (List[Article]): The articles to pull.
+
+        Returns:
+            Dict[str, int]: Counts of article bodies fetched, read from the
+            store, and failed, and of retried requests.
+        """
+        return asyncio.run(self.fetchAsync(articles))
+
+    async def fetchAsync(self, articles: List[Article]) -> Dict[str, int]:
+        """Coroutine version of fetch, for use inside a running event loop.
+
+        Args:
+            articles (List[Article]): The articles to pull.
+
+        Returns:
+            Dict[str, int]: Counts of article bodies fetched, read from the
+            store, and failed, and of retried requests.
+        """
+        by_key: Dict[str, List[Article]] = {}
+        for article in articles:
+            if article.xmlArticle is None:
+                by_key.setdefault(article.key, []).append(article)
+
+        if self.store is not None:
+            bodies = await asyncio.to_thread(self.store.getMany, list(by_key))
+            for key, body in bodies.items():
+                if self._setContent(by_key[key], body):
+                    self.stored += 1
+                    del by_key[key]
+
+        self.limit = float(self.concurrency)
+        self.active = 0
+        self.lastThrottle = 0.0
+        self.slots = asyncio.Condition()
+
+        # Fetched bodies not saved to the store yet
+        self.pending: Dict[str, str] = {}
+
+        connector = aiohttp.TCPConnector(
+            limit=self.concurrency, limit_per_host=self.concurrency
+        )
+        async with aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        ) as session:
+            try:
+                await asyncio.gather(
+                    *(
+                        self._fetchKey(session, key, group)
+                        for key, group in by_key.items()
+                    )
+                )
+            finally:
+                await self._flush()
+
+        return self.stats()
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the counts of article bodies fetched, read from the store,
+        and failed, and of retried requests."""
+        return {
+            "fetched": self.fetched,
+            "stored": self.stored,
+            "failed": self.failed,
+            "retried": self.retried,
+        }
+
+    async def _fetchKey(
+        self, session: aiohttp.ClientSession, key: str, articles: List[Article]
+    ) -> None:
+        """Fetches one article's content, retrying transient failures."""
+        url = CONTENT_URL.format(key=key)
+
+        for attempt in range(self.retries + 1):
+            status = body = retry_after = None
+
+            await self._acquire()
+            try:
+                async with session.get(url) as response:
+                    status = response.status
+                    body = await response.text() if status == 200 else None
+                    retry_after = response.headers.get("Retry-After")
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                status = body = None
+            finally:
+                await self._release(status)
+
+            if body is not None and status == 200:
+                if self._setContent(articles, body):
+                    self.fetched += 1
+                    if self.store is not None:
+                        self.pending[key] = body
+                        if len(self.pending) >= self.batchSize:
+                            await self._flush()
+                else:
+                    self.failed += 1
+                return
+
+            if status is not None and status not in RETRY_STATUSES:
+                break
+
+            if attempt < self.retries:
+                self.retried += 1
+                await asyncio.sleep(self._delay(attempt, retry_after))
+
+        self.failed += 1
+
+    async def _flush(self) -> None:
+        """Saves the pending bodies to the store in one transaction, so
+        concurrent fetches don't each wait for their own commit."""
+        if len(self.pending) == 0:
+            return
+
+        bodies, self.pending = self.pending, {}
+        await asyncio.to_thread(self.store.putMany, bodies)
+
+    def _delay(self, attempt: int, retryAfter: str | None) -> float:
+        """Picks the wait before a retry, with full jitter, but no shorter
+        than the server's Retry-After, when given in seconds."""
+        delay = random.uniform(0, min(self.maxBackoff, self.backoff * 2**attempt))
+
+        if retryAfter is not None and retryAfter.isdigit():
+            delay = max(delay, min(float(retryAfter), self.maxBackoff))
+
+        return delay
+
+    async def _acquire(self) -> None:
+        """Waits until fewer requests than the current limit are in flight."""
+        async with self.slots:
+            await self.slots.wait_for(lambda: self.active < int(self.limit))
+            self.active += 1
+
+    async def _release(self, status: int | None) -> None:
+        """Frees a request slot, adjusting the limit to the response's status,
+        None when the request failed without one. Only successes grow the
+        limit. Pushback halves it at most once per backoff interval, since a
+        burst of requests in flight tends to be refused all at once, and other
+        failures leave it alone."""
+        async with self.slots:
+            self.active -= 1
+            if status == 200:
+                self.limit = min(float(self.concurrency), self.limit + 1 / self.limit)
+            elif status in THROTTLE_STATUSES:
+                if time.monotonic() - self.lastThrottle >= self.backoff:
+                    self.limit = max(1.0, self.limit / 2)
+                    self.lastThrottle = time.monotonic()
+            self.slots.notify_all()
+
+    @staticmethod
+    def _setContent(articles: List[Article], body: str) -> bool:
+        """Parses content into each article sharing it, False if it isn't valid XML."""
+        try:
+            for article in articles:
+                article.setContent(body)
+        except (ValueError, SyntaxError):
+            return False
+
+        return True
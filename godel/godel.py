@@ -1,8 +1,11 @@
-from typing import Dict, List
+from typing import Dict, Iterator, List, Tuple
 from godel.article import Article
-from datetime import datetime
+from godel.cache import NewsCache
+from datetime import datetime, timedelta
+from multiprocessing.pool import ThreadPool
 import requests
 import json
+import time
 
 # Define a custom type for a response containing news articles categorized by tickers.
 #
@@ -21,13 +24,193 @@ import json
 # }
 type NewsResponse = Dict[str, Dict[str, List[Article]]]
 
+# News providers requested from Godel Terminal.
+NEWS_SOURCES = [
+    "Business Wire",
+    "PR Newswire",
+    "Forbes Inc.",
+    "The Washington Post",
+    "Moodys",
+    "24-7 Press Release",
+    "3BL Media",
+    "AB Digital",
+    "Access Intelligence",
+    "Accesswire",
+    "ACI Information Group",
+    "Acquisdata",
+    "Action Economics",
+    "Actusnews",
+    "Advance Publications, Inc.",
+    "Adweek",
+    "African Press Organization",
+    "Agence France Presse",
+    "AHC Media LLC",
+    "All Africa Global Media",
+    "Alliance News",
+    "APN New Zealand Ltd",
+    "ARKA News Agency",
+    "ARR News Story",
+    "Asia Business News",
+    "Associated Press, The",
+    "Atlantic Media",
+    "Australian Associated Press",
+    "Austria Press Agentur",
+    "Autovia",
+    "Baystreet.ca",
+    "Benzinga",
+    "Black Press Group",
+    "Blockchain Wire",
+    "bne IntelliNews",
+    "BNK Invest",
+    "Boston Globe, The",
+    "Breaking Media",
+    "BridgeTower Media",
+    "British Broadcasting Corporation - BBC Monitoring",
+    "Canada Newswire",
+    "Canadian Press, The",
+    "Canjex Publishing Ltd",
+    "Cision",
+    "City AM",
+    "ContentEngine",
+    "CryptoQuant",
+    "Dennis Publishing",
+    "Dig Media",
+    "dpa-AFX",
+    "dpa Deutsche Presse-Agentur GmbH",
+    "DVV Media Group",
+    "Economist Intelligence Unit",
+    "Edison Investment Research Limited",
+    "EFE News Service",
+    "Elsevier CBNB",
+    "Endeavor",
+    "Federal Information & News Dispatch, Inc.",
+    "Forkast",
+    "Foundry",
+    "Gale Group",
+    "Gannett Media Corp",
+    "GlobeNewswire",
+    "GO Media",
+    "Government Executive Media Group",
+    "Hearst",
+    "Hong Kong Free Press",
+    "HT Media",
+    "iCrowdNewswire",
+    "Independent Digital News and Media",
+    "Independent News and Media",
+    "Independent Newspapers Limited",
+    "Informatics India Limited",
+    "Information Solutions",
+    "InPublic - GlobeNewswire",
+    "Inside Washington Publishers",
+    "Interfax America Inc.",
+    "Interfax-Ukraine",
+    "Inter Press Service",
+    "InvestorBrandNetwork",
+    "Itar-Tass",
+    "Japan Corporate News",
+    "Johnston Press",
+    "Kabar",
+    "Kyiv Independent",
+    "Kyodo News International, Inc.",
+    "M2 Communications",
+    "Market Exclusive",
+    "MarketLine",
+    "M-Brain Oy",
+    "Media-OutReach",
+    "Medqor",
+    "Metropolis Business Media",
+    "MJH Life Sciences",
+    "Modular Finance",
+    "Mondaq",
+    "Multimedia Investments Ltd",
+    "National Journal Group",
+    "Networld Alliance",
+    "NewMediaWire",
+    "NewsBank",
+    "News Data Service",
+    "News Direct",
+    "Newsfile Corp",
+    "NewsRx.com",
+    "New Straits Times",
+    "NewsUSA",
+    "NewsVoir",
+    "Nordot",
+    "NTB Norway",
+    "Omniearth",
+    "OMX",
+    "Orbit Financial Technology Limited",
+    "Oslo Bors ASA",
+    "OTC PR Wire",
+    "Pakistan Press International",
+    "Pedia Content Solutions",
+    "Penton Business Media",
+    "People Support Transcription & Captioning",
+    "Plus Media Solutions Pakistan",
+    "Polish Press Agency",
+    "PR.com",
+    "Pressat",
+    "PRISM Mediawire",
+    "ProQuest Information & Learning",
+    "PR Web",
+    "Public Technologies",
+    "Publishers Weekly",
+    "Questex",
+    "ReleaseWire",
+    "Reportable",
+    "Ritzau Denmark",
+    "Roy Morgan International Limited",
+    "Russell Publishing",
+    "San Francisco Chronicle",
+    "Schaeffers Investment Research",
+    "SeeNews",
+    "Sightline Media Group",
+    "Solo Syndication Ltd.",
+    "South American Business Information",
+    "SPH Media",
+    "Sports Business Journal",
+    "STT Info Finland",
+    "SyndiGate Media Inc.",
+    "Targeted News Service",
+    "Tenders",
+    "Thai News Service",
+    "The Content Exchange",
+    "The Logic",
+    "The New Republic",
+    "TheNewswire.ca",
+    "The Press Association UK",
+    "TipRanks",
+    "Trend News Agency",
+    "Tribune Content Agency",
+    "TT News Agency Sweden",
+    "UKRINFORM",
+    "Uloop",
+    "United Press International",
+    "Vietnam News Agency",
+    "William Reed Business Media",
+    "Winnipeg Free Press Co. Ltd.",
+    "WPS USA Inc.",
+    "Xinhua News Agency",
+    "Yonhap News Agency",
+    "Zack Investment Research",
+    "Zinio",
+]
+
+# Page size used when no page size is given, large enough to fetch everything at once.
+UNBOUNDED_PAGE_SIZE = 10000000
+
+
+class CursorError(RuntimeError):
+    """Raised when a full page of news comes back without a cursor to the next page."""
+
 
 class Godel:
     def __init__(self):
         pass
 
     @staticmethod
-    def queryNews(tickers: List[str], startDate: str, endDate: str) -> NewsResponse:
+    def queryNews(
+        tickers: List[str], startDate: str, endDate: str, pageSize: int | None = None
+    ) -> NewsResponse:
         """Queries Godel Terminal for news articles about a given list
         of tickers, starting from a specific date, and ending at a specific date.
         start/endDate format: 09-20-2003 -> September 20, 2003
@@ -36,10 +219,254 @@ class Godel:
             tickers (List[str]): The list of tickers to request news for.
             startDate (str): The start date to begin looking for news.
             endDate (str): The cutoff date to stop looking for news.
+            pageSize (int | None): Number of articles requested per page, see iterNews.
+            If None, all articles are requested at once.
+
+        Returns:
+            NewsResponse: An object containing tickers mapping to a list of Articles.
+
+        """
+        news_object = {ticker: {} for ticker in tickers}
+
+        for parsed in Godel.iterNews(tickers, startDate, endDate, pageSize):
+            Godel._addArticle(news_object, parsed)
+
+        return news_object
+
+    @staticmethod
+    def queryNewsSharded(
+        tickers: List[str],
+        startDate: str,
+        endDate: str,
+        windowDays: int = 90,
+        threads: int = 8,
+        retries: int = 3,
+        pageSize: int | None = 1000,
+        cache: NewsCache | None = None,
+    ) -> NewsResponse:
+        """Queries Godel Terminal for news articles like queryNews, but splits
+        the date range into windows of windowDays days that are queried
+        concurrently. A failed window is retried on its own, and articles
+        returned by two windows are only kept once.
+        start/endDate format: 09-20-2003 -> September 20, 2003
+
+        With a cache, only the days missing from it are queried, one ticker per
+        window, and each window is saved as soon as it is fetched. Listings are
+        then read from the cache, from startDate up to but not including endDate.
+
+        Args:
+            tickers (List[str]): The list of tickers to request news for.
+            startDate (str): The start date to begin looking for news.
+            endDate (str): The cutoff date to stop looking for news.
+            windowDays (int): Number of days queried by each request, defaults to 90.
+            threads (int): Number of windows queried at once, defaults to 8.
+            retries (int): Number of times a failed window is retried, defaults to 3.
+            pageSize (int | None): Number of articles requested per page, see iterNews.
+            cache (NewsCache | None): If given, listings are read from and added to the cache.
 
         Returns:
             NewsResponse: An object containing tickers mapping to a list of Articles.
+        """
+        if cache is None:
+            shards = [
+                (tickers, shard_start, shard_end)
+                for shard_start, shard_end in Godel._shardDates(
+                    startDate, endDate, windowDays
+                )
+            ]
+        else:
+            start_date = datetime.strptime(startDate, "%m-%d-%Y").date()
+            end_date = datetime.strptime(endDate, "%m-%d-%Y").date()
+            shards = [
+                ([ticker], shard_start, shard_end)
+                for ticker in tickers
+                for missing_start, missing_end in cache.missingRanges(
+                    ticker, start_date, end_date
+                )
+                for shard_start, shard_end in Godel._shardDates(
+                    missing_start.strftime("%m-%d-%Y"),
+                    missing_end.strftime("%m-%d-%Y"),
+                    windowDays,
+                )
+            ]
+
+        def fetchShard(shard: Tuple[List[str], str, str]) -> List[Article]:
+            shard_tickers, shard_start, shard_end = shard
+            articles = Godel._queryShard(
+                shard_tickers, shard_start, shard_end, retries, pageSize
+            )
+            if cache is not None:
+                cache.store(
+                    shard_tickers[0],
+                    articles,
+                    datetime.strptime(shard_start, "%m-%d-%Y").date(),
+                    datetime.strptime(shard_end, "%m-%d-%Y").date(),
+                )
+            return articles
+
+        results = []
+        if len(shards) > 0:
+            pool = ThreadPool(min(threads, len(shards)))
+            try:
+                results = pool.map(fetchShard, shards)
+            finally:
+                pool.close()
+                pool.join()
+
+        if cache is not None:
+            return {
+                ticker: cache.load(ticker, start_date, end_date) for ticker in tickers
+            }
+
+        news_object = {ticker: {} for ticker in tickers}
+        seen = set()
+
+        for articles in results:
+            for parsed in articles:
+                if (parsed.ticker, parsed.key) in seen:
+                    continue
+                seen.add((parsed.ticker, parsed.key))
+                Godel._addArticle(news_object, parsed)
+
+        return news_object
+
+    @staticmethod
+    def _shardDates(
+        startDate: str, endDate: str, windowDays: int
+    ) -> List[Tuple[str, str]]:
+        """Splits a date range into consecutive windows of at most windowDays days.
+        Each window starts on the day the previous one ends.
+
+        Args:
+            startDate (str): The start date of the range, example: 09-20-2003.
+            endDate (str): The end date of the range.
+            windowDays (int): Number of days in each window.
+
+        Returns:
+            List[Tuple[str, str]]: The start and end date of each window.
+        """
+        if windowDays < 1:
+            raise ValueError("windowDays must be a positive integer.")
+
+        start = datetime.strptime(startDate, "%m-%d-%Y")
+        end = datetime.strptime(endDate, "%m-%d-%Y")
+
+        shards = []
+        while True:
+            shard_end = min(start + timedelta(days=windowDays), end)
+            shards.append((start.strftime("%m-%d-%Y"), shard_end.strftime("%m-%d-%Y")))
+            if shard_end >= end:
+                return shards
+            start = shard_end
+
+    @staticmethod
+    def _queryShard(
+        tickers: List[str],
+        startDate: str,
+        endDate: str,
+        retries: int,
+        pageSize: int | None,
+    ) -> List[Article]:
+        """Fetches every article of one window, retrying the whole window with
+        exponential backoff if a request fails. If the window can't be paged
+        through, it is fetched again in a single unbounded request.
+
+        Args:
+            tickers (List[str]): The list of tickers to request news for.
+            startDate (str): The start date of the window.
+            endDate (str): The end date of the window.
+            retries (int): Number of times the window is retried.
+            pageSize (int | None): Number of articles requested per page.
+
+        Returns:
+            List[Article]: The window's articles.
+        """
+        for attempt in range(retries + 1):
+            try:
+                return list(Godel.iterNews(tickers, startDate, endDate, pageSize))
+            except CursorError:
+                return Godel._queryShard(tickers, startDate, endDate, retries, None)
+            except (requests.RequestException, ValueError, KeyError):
+                if attempt == retries:
+                    raise
+                time.sleep(2**attempt)
+
+        return []
+
+    @staticmethod
+    def iterNews(
+        tickers: List[str],
+        startDate: str,
+        endDate: str,
+        pageSize: int | None = 1000,
+    ) -> Iterator[Article]:
+        """Queries Godel Terminal for news articles about a given list of
+        tickers page by page, following the API's cursors, and yields the
+        articles as each page arrives. Only one page is held in memory at a time.
+        Raises a CursorError when a full page has no new cursor to the next one,
+        since the articles yielded so far would be incomplete.
+        start/endDate format: 09-20-2003 -> September 20, 2003
+
+        Args:
+            tickers (List[str]): The list of tickers to request news for.
+            startDate (str): The start date to begin looking for news.
+            endDate (str): The cutoff date to stop looking for news.
+            pageSize (int | None): Number of articles requested per page, defaults to 1000.
+            If None, all articles are requested in a single page.
 
+        Returns:
+            Iterator[Article]: One Article per requested ticker each news article is about.
+        """
+        cursor = None
+        seen_cursors = set()
+
+        while True:
+            postBody = Godel._postBody(
+                tickers, startDate, endDate, pageSize or UNBOUNDED_PAGE_SIZE, cursor
+            )
+
+            response = requests.post(
+                "https://api.godelterminal.com/api/paged/news",
+                json.dumps(postBody),
+                headers={"Content-Type": "application/json"},
+            )
+
+            page = response.json()
+
+            for article in page["content"]:
+                yield from Godel._parseArticle(article, tickers)
+
+            if pageSize is None or len(page["content"]) < pageSize:
+                return
+
+            # The next page is requested with the cursor the API returns for it.
+            cursor = page.get("afterCursor")
+            if cursor is None or cursor in seen_cursors:
+                raise CursorError(
+                    f"A full page of {pageSize} articles from {startDate} to {endDate} "
+                    "came back without a new afterCursor."
+                )
+            seen_cursors.add(cursor)
+
+    @staticmethod
+    def _postBody(
+        tickers: List[str],
+        startDate: str,
+        endDate: str,
+        size: int,
+        afterCursor: str | None = None,
+    ) -> dict:
+        """Builds the body of a paged news request.
+
+        Args:
+            tickers (List[str]): The list of tickers to request news for.
+            startDate (str): The start date to begin looking for news, example: 09-20-2003.
+            endDate (str): The cutoff date to stop looking for news.
+            size (int): Number of articles requested.
+            afterCursor (str | None): Cursor of the page to request, None for the first page.
+
+        Returns:
+            dict: The request body.
         """
         start = (
             datetime.strptime(startDate, "%m-%d-%Y").strftime("%Y-%m-%dT%H:%m:%S.")
@@ -49,212 +476,55 @@ class Godel:
             datetime.strptime(endDate, "%m-%d-%Y").strftime("%Y-%m-%dT%H:%m:%S.")
             + "000Z"
         )
-        postBody = {
-            "size": 10000000,
+        return {
+            "size": size,
             "start": start,
             "end": end,
             "beforeCursor": None,
-            "sources": [
-                "Business Wire",
-                "PR Newswire",
-                "Forbes Inc.",
-                "The Washington Post",
-                "Moodys",
-                "24-7 Press Release",
-                "3BL Media",
-                "AB Digital",
-                "Access Intelligence",
-                "Accesswire",
-                "ACI Information Group",
-                "Acquisdata",
-                "Action Economics",
-                "Actusnews",
-                "Advance Publications, Inc.",
-                "Adweek",
-                "African Press Organization",
-                "Agence France Presse",
-                "AHC Media LLC",
-                "All Africa Global Media",
-                "Alliance News",
-                "APN New Zealand Ltd",
-                "ARKA News Agency",
-                "ARR News Story",
-                "Asia Business News",
-                "Associated Press, The",
-                "Atlantic Media",
-                "Australian Associated Press",
-                "Austria Press Agentur",
-                "Autovia",
-                "Baystreet.ca",
-                "Benzinga",
-                "Black Press Group",
-                "Blockchain Wire",
-                "bne IntelliNews",
-                "BNK Invest",
-                "Boston Globe, The",
-                "Breaking Media",
-                "BridgeTower Media",
-                "British Broadcasting Corporation - BBC Monitoring",
-                "Canada Newswire",
-                "Canadian Press, The",
-                "Canjex Publishing Ltd",
-                "Cision",
-                "City AM",
-                "ContentEngine",
-                "CryptoQuant",
-                "Dennis Publishing",
-                "Dig Media",
-                "dpa-AFX",
-                "dpa Deutsche Presse-Agentur GmbH",
-                "DVV Media Group",
-                "Economist Intelligence Unit",
-                "Edison Investment Research Limited",
-                "EFE News Service",
-                "Elsevier CBNB",
-                "Endeavor",
-                "Federal Information & News Dispatch, Inc.",
-                "Forkast",
-                "Foundry",
-                "Gale Group",
-                "Gannett Media Corp",
-                "GlobeNewswire",
-                "GO Media",
-                "Government Executive Media Group",
-                "Hearst",
-                "Hong Kong Free Press",
-                "HT Media",
-                "iCrowdNewswire",
-                "Independent Digital News and Media",
-                "Independent News and Media",
-                "Independent Newspapers Limited",
-                "Informatics India Limited",
-                "Information Solutions",
-                "InPublic - GlobeNewswire",
-                "Inside Washington Publishers",
-                "Interfax America Inc.",
-                "Interfax-Ukraine",
-                "Inter Press Service",
-                "InvestorBrandNetwork",
-                "Itar-Tass",
-                "Japan Corporate News",
-                "Johnston Press",
-                "Kabar",
-                "Kyiv Independent",
-                "Kyodo News International, Inc.",
-                "M2 Communications",
-                "Market Exclusive",
-                "MarketLine",
-                "M-Brain Oy",
-                "Media-OutReach",
-                "Medqor",
-                "Metropolis Business Media",
-                "MJH Life Sciences",
-                "Modular Finance",
-                "Mondaq",
-                "Multimedia Investments Ltd",
-                "National Journal Group",
-                "Networld Alliance",
-                "NewMediaWire",
-                "NewsBank",
-                "News Data Service",
-                "News Direct",
-                "Newsfile Corp",
-                "NewsRx.com",
-                "New Straits Times",
-                "NewsUSA",
-                "NewsVoir",
-                "Nordot",
-                "NTB Norway",
-                "Omniearth",
-                "OMX",
-                "Orbit Financial Technology Limited",
-                "Oslo Bors ASA",
-                "OTC PR Wire",
-                "Pakistan Press International",
-                "Pedia Content Solutions",
-                "Penton Business Media",
-                "People Support Transcription & Captioning",
-                "Plus Media Solutions Pakistan",
-                "Polish Press Agency",
-                "PR.com",
-                "Pressat",
-                "PRISM Mediawire",
-                "ProQuest Information & Learning",
-                "PR Web",
-                "Public Technologies",
-                "Publishers Weekly",
-                "Questex",
-                "ReleaseWire",
-                "Reportable",
-                "Ritzau Denmark",
-                "Roy Morgan International Limited",
-                "Russell Publishing",
-                "San Francisco Chronicle",
-                "Schaeffers Investment Research",
-                "SeeNews",
-                "Sightline Media Group",
-                "Solo Syndication Ltd.",
-                "South American Business Information",
-                "SPH Media",
-                "Sports Business Journal",
-                "STT Info Finland",
-                "SyndiGate Media Inc.",
-                "Targeted News Service",
-                "Tenders",
-                "Thai News Service",
-                "The Content Exchange",
-                "The Logic",
-                "The New Republic",
-                "TheNewswire.ca",
-                "The Press Association UK",
-                "TipRanks",
-                "Trend News Agency",
-                "Tribune Content Agency",
-                "TT News Agency Sweden",
-                "UKRINFORM",
-                "Uloop",
-                "United Press International",
-                "Vietnam News Agency",
-                "William Reed Business Media",
-                "Winnipeg Free Press Co. Ltd.",
-                "WPS USA Inc.",
-                "Xinhua News Agency",
-                "Yonhap News Agency",
-                "Zack Investment Research",
-                "Zinio",
-            ],
+            "sources": NEWS_SOURCES,
             "languages": ["en"],
-            "afterCursor": None,
+            "afterCursor": afterCursor,
             "symbols": tickers,
         }
 
-        news_object = {ticker: {} for ticker in tickers}
+    @staticmethod
+    def _parseArticle(article: dict, tickers: List[str]) -> List[Article]:
+        """Builds an Article for each requested ticker a news article is about.
 
-        response = requests.post(
-            "https://api.godelterminal.com/api/paged/news",
-            json.dumps(postBody),
-            headers={"Content-Type": "application/json"},
-        )
+        Args:
+            article (dict): The news article, as returned by the API.
+            tickers (List[str]): The requested tickers.
 
-        response_obj = response.json()["content"]
-
-        for article in response_obj:
-
-            for security_ticker in article["securityIds"]:
-                if security_ticker in news_object:
-                    parsed = Article(
-                        security_ticker,
-                        article["providerName"],
-                        article["key"],
-                        article["publicationTime"],
-                        article["title"],
-                        article["description"],
-                    )
-                    article_dt = datetime.strptime(
-                        parsed.publicationTime, "%Y-%m-%dT%H:%M:%SZ"
-                    ).strftime("%Y-%m-%d")
-                    if article_dt not in news_object[security_ticker]:
-                        news_object[security_ticker][article_dt] = []
-                    news_object[security_ticker][article_dt].append(parsed)
+        Returns:
+            List[Article]: The Articles, one per matching ticker.
+        """
+        return [
+            Article(
+                security_ticker,
+                article["providerName"],
+                article["key"],
+                article["publicationTime"],
+                article["title"],
+                article["description"],
+            )
+            for security_ticker in article["securityIds"]
+            if security_ticker in tickers
+        ]
 
-        return news_object
+    @staticmethod
+    def _addArticle(news_object: NewsResponse, parsed: Article) -> None:
+        """Adds an Article to a NewsResponse, under its ticker and publication day.
+
+        Args:
+            news_object (NewsResponse): The response being built.
+            parsed (Article): The Article to add.
+
+        Returns:
+            None
+        """
+        article_dt = datetime.strptime(
+            parsed.publicationTime, "%Y-%m-%dT%H:%M:%SZ"
+        ).strftime("%Y-%m-%d")
+        if article_dt not in news_object[parsed.ticker]:
+            news_object[parsed.ticker][article_dt] = []
+        news_object[parsed.ticker][article_dt].append(parsed)
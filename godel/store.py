@@ -0,0 +1,153 @@
+import sqlite3
+import zlib
+from contextlib import closing
+from typing import Dict, List
+from localcache import SQLiteCache
+
+
+class ArticleStore(SQLiteCache):
+    def __init__(self, path: str | None = None):
+        """Opens (creating if needed) an SQLite store of article bodies, keyed
+        by Article.key. Bodies never change once published, so each is
+        downloaded once and kept as a zlib compressed blob.
+
+        Args:
+            path (str | None): Path of the SQLite file, defaults to articles.sqlite in CACHE_DIR.
+
+        Returns:
+            None
+        """
+        super().__init__(
+            path,
+            "articles.sqlite",
+            """
+            CREATE TABLE IF NOT EXISTS articles (
+                key TEXT PRIMARY KEY,
+                body BLOB NOT NULL
+            );
+            """,
+        )
+
+    def get(self, key: str) -> str | None:
+        """Reads an article's body.
+
+        Args:
+            key (str): The article's key.
+
+        Returns:
+            str | None: The body's XML, None if it isn't stored.
+        """
+        with closing(self.connect()) as connection:
+            row = connection.execute(
+                "SELECT body FROM articles WHERE key = ?", (key,)
+            ).fetchone()
+
+        return zlib.decompress(row[0]).decode("utf-8") if row else None
+
+    def getMany(self, keys: List[str]) -> Dict[str, str]:
+        """Reads the bodies of many articles.
+
+        Args:
+            keys (List[str]): The articles' keys.
+
+        Returns:
+            Dict[str, str]: The stored keys mapping to their body's XML.
+        """
+        bodies = {}
+
+        with closing(self.connect()) as connection:
+            for key, body in self._select(connection, "key, body", keys):
+                bodies[key] = zlib.decompress(body).decode("utf-8")
+
+        return bodies
+
+    def put(self, key: str, body: str) -> None:
+        """Saves an article's body.
+
+        Args:
+            key (str): The article's key.
+            body (str): The body's XML.
+
+        Returns:
+            None
+        """
+        with closing(self.connect()) as connection, connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO articles (key, body) VALUES (?, ?)",
+                (key, zlib.compress(body.encode("utf-8"))),
+            )
+
+    def putMany(self, bodies: Dict[str, str]) -> None:
+        """Saves the bodies of many articles in one transaction.
+
+        Args:
+            bodies (Dict[str, str]): The articles' keys mapping to their body's XML.
+
+        Returns:
+            None
+        """
+        with closing(self.connect()) as connection, connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO articles (key, body) VALUES (?, ?)",
+                [
+                    (key, zlib.compress(body.encode("utf-8")))
+                    for key, body in bodies.items()
+                ],
+            )
+
+    def missing(self, keys: List[str]) -> List[str]:
+        """Finds the keys whose bodies aren't stored yet.
+
+        Args:
+            keys (List[str]): The articles' keys.
+
+        Returns:
+            List[str]: The keys not in the store, without duplicates.
+        """
+        with closing(self.connect()) as connection:
+            stored = {key for (key,) in self._select(connection, "key", keys)}
+
+        return [key for key in dict.fromkeys(keys) if key not in stored]
+
+    def prefetch(self, keys: List[str], concurrency: int = 64) -> int:
+        """Downloads and saves the bodies of the given articles that aren't
+        stored yet, with an ArticleFetcher, so failed requests are retried and
+        throttled. Bodies that don't parse as XML aren't saved.
+
+        Args:
+            keys (List[str]): The articles' keys.
+            concurrency (int): Maximum number of requests in flight, defaults to 64.
+
+        Returns:
+            int: Number of bodies downloaded.
+        """
+        # Imported here, since article.py and fetcher.py import this module
+        from godel.article import Article
+        from godel.fetcher import ArticleFetcher
+
+        missing = self.missing(keys)
+
+        if len(missing) == 0:
+            return 0
+
+        # Only the key is needed to fetch an article's content
+        articles = [Article("", "", key, "", "", "") for key in missing]
+
+        return ArticleFetcher(concurrency, store=self).fetch(articles)["fetched"]
+
+    @staticmethod
+    def _select(connection: sqlite3.Connection, columns: str, keys: List[str]) -> List:
+        """Selects columns of the stored articles with the given keys, in
+        batches below SQLite's limit on query parameters."""
+        rows = []
+        keys = list(keys)
+
+        for i in range(0, len(keys), 500):
+            batch = keys[i : i + 500]
+            rows += connection.execute(
+                f"SELECT {columns} FROM articles WHERE key IN"
+                f" ({', '.join('?' * len(batch))})",
+                batch,
+            ).fetchall()
+
+        return rows
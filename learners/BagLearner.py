@@ -1,9 +1,14 @@
+import os
+from contextlib import nullcontext
+from itertools import starmap
+from multiprocessing import Pool
 from typing import Any, Type, cast
 from learners.DTLearner import DTLearner
 from learners.RTLearner import RTLearner
+from learners.persistence import LEARNER_TYPES, load_trees, save_trees
+from learners.utils import feature_matrix, quantize_features
 import pandas as pd
 import numpy as np
-from scipy.stats import mode
 from sklearn.metrics import (
     accuracy_score,
     confusion_matrix,
@@ -14,6 +19,61 @@ from sklearn.metrics import (
     f1_score,
 )
 
+# Ways BagLearner.update can choose which bags to retire
+RETIRE_POLICIES = ("oldest", "worst")
+
+# Training data shared by every bag, set once per worker process
+_shared_data: tuple[np.ndarray, np.ndarray, tuple | None] = (
+    np.empty((0, 0)),
+    np.empty(0),
+    None,
+)
+
+
+def _share_data(
+    dataX: np.ndarray,
+    dataY: np.ndarray,
+    binned: tuple[np.ndarray, np.ndarray, np.ndarray] | None = None,
+) -> None:
+    """Stores the training data for the bags trained by this process.
+    Parameters:
+        dataX (np.ndarray): Feature matrix for training.
+        dataY (np.ndarray): Target values for training.
+        binned (tuple | None): Output of quantize_features for dataX, if learners use bins.
+    Returns:
+        None
+    """
+    global _shared_data
+    _shared_data = (dataX, dataY, binned)
+
+
+def _train_bag(
+    learner: DTLearner, seed: np.random.SeedSequence
+) -> tuple[DTLearner, np.ndarray, np.ndarray]:
+    """Draws bootstrap row indexes over the shared training data and trains
+    one learner on them, then predicts the rows the bootstrap left out.
+    Defined at module level so it can be sent to worker processes.
+    Parameters:
+        learner (DTLearner): The untrained learner.
+        seed (np.random.SeedSequence): Seed of this bag's random stream.
+    Returns:
+        tuple[DTLearner, np.ndarray, np.ndarray]: The trained learner,
+        out-of-bag row indexes, predictions for the out-of-bag rows.
+    """
+    dataX, dataY, binned = _shared_data
+
+    rng = np.random.default_rng(seed)
+
+    random_indexes = rng.integers(0, len(dataX), size=len(dataX))
+
+    # The learner continues the bag's stream for its own random choices
+    learner.rng = rng
+    learner.add_evidence_matrix(dataX, dataY, random_indexes, binned)
+
+    oob_indexes = np.flatnonzero(np.bincount(random_indexes, minlength=len(dataX)) == 0)
+
+    return learner, oob_indexes, learner.query_matrix(dataX[oob_indexes])
+
 
 class BagLearner:
     def __init__(
@@ -22,7 +82,12 @@ class BagLearner:
         bags: int,
         classifier=False,
         *args: Any,
-        **kwargs: Any
+        n_jobs: int | None = 1,
+        seed: int | None = None,
+        oob_tolerance: float | None = None,
+        oob_window: int = 10,
+        chunk_size: int = 65536,
+        **kwargs: Any,
     ) -> None:
         """Constructor for BagLearner.
         Defines an array that contains each learner.
@@ -31,6 +96,15 @@ class BagLearner:
             bags (int): The number of bags to create.
             classifier (boolena=False): Whether the BagLearner is a classification model.
             *args (Any): Unspecified arguments to pass to the learners.
+            n_jobs (int | None=1): Number of worker processes used to train bags,
+                                   None uses every available core.
+            seed (int | None=None): Master seed every bag's seed is derived from.
+            oob_tolerance (float | None=None): If set, bags are added oob_window at a time
+                                               and training stops once the out-of-bag score
+                                               changes by no more than this amount, so
+                                               bags becomes the maximum ensemble size.
+            oob_window (int=10): Number of bags added between out-of-bag checks.
+            chunk_size (int=65536): Number of rows predicted at a time, bounding memory use.
             **kwargs (Any): Keyworded arguments to pass to the learners.
         Returns:
             None
@@ -38,54 +112,449 @@ class BagLearner:
         self.learners = [
             learner(classifier=classifier, *args, **kwargs) for _ in range(bags)
         ]
+        self.learner = learner
+        self.learner_args = args
+        self.learner_kwargs = kwargs
         self.classifier = classifier
+        self.classes = np.empty(0)
+        self.n_jobs = n_jobs if n_jobs is not None else os.cpu_count() or 1
+        self.seed = seed
+        self.seed_sequence = np.random.SeedSequence(seed)
+        self.oob_tolerance = oob_tolerance
+        self.oob_window = oob_window
+        self.chunk_size = chunk_size
+        self.oob_indexes: list[np.ndarray] = []
+        self.oob_scores: list[float] = []
 
     def add_evidence(self, dataX: pd.DataFrame, dataY: pd.Series) -> None:
-        """Creates a new subset of feature and target data for each learner.
-        Then trains each learner.
+        """Trains each learner on bootstrap row indexes drawn over one
+        shared feature matrix, so no bag copies the training data.
         Parameters:
             dataX (pd.DataFrame): Feature matrix for training.
             dataY (pd.Series): Target values for training.
         Returns:
             None
         """
+        self.add_evidence_matrix(
+            np.ascontiguousarray(dataX.to_numpy(dtype=float)),
+            np.asarray(dataY, dtype=float),
+            [str(column) for column in dataX.columns],
+        )
+
+    def add_evidence_matrix(
+        self, dataX: np.ndarray, dataY: np.ndarray, features: list[str]
+    ) -> None:
+        """Trains each learner on a float feature matrix.
+        Parameters:
+            dataX (np.ndarray): Feature matrix for training.
+            dataY (np.ndarray): Target values for training.
+            features (list[str]): Labels of the feature matrix's columns.
+        Returns:
+            None
+        """
         for learner in self.learners:
-            random_indexes = dataX.sample(n=len(dataX), replace=True).index
+            learner.features = features
+
+        self.seed_sequence = np.random.SeedSequence(self.seed)
+
+        if self.classifier:
+            self.classes = np.unique(dataY)
+
+        self.learners = self.train_bags(self.learners, dataX, dataY)
+
+    def update(
+        self,
+        dataX: pd.DataFrame,
+        dataY: pd.Series,
+        bags: int,
+        window: int | None = None,
+        max_bags: int | None = None,
+        retire: str = "oldest",
+    ) -> None:
+        """Warm starts the ensemble with new data. Trains new bags on a recent
+        window only and appends them, then retires bags beyond max_bags, so
+        an update costs in proportion to the window rather than the history.
+        The out-of-bag records afterwards describe the new bags on the window.
+        Parameters:
+            dataX (pd.DataFrame): Feature matrix of recent data.
+            dataY (pd.Series): Target values of recent data.
+            bags (int): The number of bags to add.
+            window (int | None=None): Only train on the last window rows, all rows if None.
+            max_bags (int | None=None): Maximum ensemble size after the update, unbounded if None.
+            retire (str="oldest"): Which existing bags to retire first, either the
+                                   "oldest" or the "worst" scoring on the window.
+        Returns:
+            None
+        """
+        if retire not in RETIRE_POLICIES:
+            raise ValueError(f"Unknown retire policy: {retire}.")
+
+        if window is not None:
+            dataX = dataX.iloc[-window:]
+            dataY = dataY.iloc[-window:]
+
+        features = [str(column) for column in dataX.columns]
+        if len(self.learners) > 0:
+            features = self.learners[0].features
+
+        matrixX = np.ascontiguousarray(dataX[features].to_numpy(dtype=float))
+        matrixY = np.asarray(dataY, dtype=float)
 
-            sampled_dataX = dataX.loc[random_indexes]
+        new_learners = [
+            self.learner(
+                classifier=self.classifier, *self.learner_args, **self.learner_kwargs
+            )
+            for _ in range(bags)
+        ]
+
+        for learner in new_learners:
+            learner.features = features
+
+        if self.classifier:
+            self.classes = np.union1d(self.classes, np.unique(matrixY))
+
+        old_learners = self.learners
+        new_learners = self.train_bags(new_learners, matrixX, matrixY)
+
+        excess = 0
+        if max_bags is not None:
+            excess = max(len(old_learners) + len(new_learners) - max_bags, 0)
+
+        if retire == "worst" and excess > 0 and len(old_learners) > 0:
+            scores = [
+                self.score_learner(learner, matrixX, matrixY)
+                for learner in old_learners
+            ]
+
+            # Lowest scores first, older bags first on ties
+            retired = set(
+                np.argsort(scores, kind="stable")[: min(excess, len(old_learners))]
+            )
+
+            old_learners = [
+                learner
+                for index, learner in enumerate(old_learners)
+                if index not in retired
+            ]
+            excess -= len(retired)
+
+        # Bags are kept oldest first
+        self.learners = (old_learners + new_learners)[excess:]
+
+    def score_learner(
+        self, learner: DTLearner, dataX: np.ndarray, dataY: np.ndarray
+    ) -> float:
+        """Scores a single learner on the given data, higher is better.
+        Parameters:
+            learner (DTLearner): The learner to score.
+            dataX (np.ndarray): Feature matrix.
+            dataY (np.ndarray): Target values.
+        Returns:
+            float: Accuracy for classifiers, negative Root Mean Squared Error otherwise
+        """
+        predictions = learner.query_matrix(dataX)
+
+        if self.classifier:
+            return float(np.mean(predictions == dataY))
+
+        return -float(np.sqrt(np.mean((predictions - dataY) ** 2)))
 
-            sampled_dataY = dataY[random_indexes]
+    def train_bags(
+        self, learners: list[DTLearner], dataX: np.ndarray, dataY: np.ndarray
+    ) -> list[DTLearner]:
+        """Trains learners on bootstrap samples of the given data, in worker
+        processes if n_jobs allows, recording their out-of-bag predictions.
+        Stops early once the out-of-bag score plateaus if oob_tolerance is set.
+        Parameters:
+            learners (list[DTLearner]): The untrained learners.
+            dataX (np.ndarray): Feature matrix for training.
+            dataY (np.ndarray): Target values for training.
+        Returns:
+            list[DTLearner]: The trained learners.
+        """
+        # Seeds depend only on the master seed and bag position,
+        # so the ensemble is identical for any number of workers
+        seeds = self.seed_sequence.spawn(len(learners))
+
+        tasks = list(zip(learners, seeds))
+
+        self.reset_oob(dataY)
+
+        if len(tasks) == 0:
+            return []
+
+        # Batches only depend on the settings, never on the worker count
+        batch_size = len(tasks)
+        if self.oob_tolerance is not None:
+            batch_size = max(self.oob_window, 1)
+
+        # Features are quantized once, for every bag
+        binned = None
+        if len(learners) > 0 and learners[0].bins is not None:
+            binned = quantize_features(dataX, learners[0].bins)
+
+        parallel = self.n_jobs > 1 and len(tasks) > 1
+        if not parallel:
+            _share_data(dataX, dataY, binned)
 
-            sampled_dataX = cast(pd.DataFrame, sampled_dataX)
-            sampled_dataY = cast(pd.Series, sampled_dataY)
+        trained = []
 
-            sampled_dataX = sampled_dataX.reset_index()
+        try:
+            with (
+                Pool(
+                    min(self.n_jobs, len(tasks)),
+                    initializer=_share_data,
+                    initargs=(dataX, dataY, binned),
+                )
+                if parallel
+                else nullcontext()
+            ) as pool:
+                for start in range(0, len(tasks), batch_size):
+                    batch = tasks[start : start + batch_size]
+                    results = (
+                        pool.starmap(_train_bag, batch)
+                        if pool is not None
+                        else list(starmap(_train_bag, batch))
+                    )
 
-            sampled_dataX = sampled_dataX.drop(["Date"], axis=1)
+                    for learner, oob_indexes, oob_predictions in results:
+                        trained.append(learner)
+                        self.add_oob_predictions(oob_indexes, oob_predictions)
 
-            target_label = sampled_dataY.name
+                    self.oob_scores.append(self.oob_score())
 
-            sampled_dataY = sampled_dataY.reset_index().pop(target_label)
+                    if (
+                        self.oob_tolerance is not None
+                        and len(self.oob_scores) > 1
+                        and abs(self.oob_scores[-1] - self.oob_scores[-2])
+                        <= self.oob_tolerance
+                    ):
+                        break
+        finally:
+            if not parallel:
+                _share_data(np.empty((0, 0)), np.empty(0))
 
-            learner.add_evidence(sampled_dataX, sampled_dataY)
+        return trained
 
-    def query(self, points: list[dict]) -> np.ndarray:
+    def reset_oob(self, dataY: np.ndarray) -> None:
+        """Clears the out-of-bag records and prepares vote (classification)
+        or running sum (regression) accumulators for the training targets.
+        Parameters:
+            dataY (np.ndarray): Target values for training.
+        Returns:
+            None
+        """
+        self.oob_y = dataY
+        self.oob_indexes = []
+        self.oob_scores = []
+
+        if self.classifier:
+            self.oob_votes = np.zeros((len(dataY), len(self.classes)), dtype=np.int64)
+        else:
+            self.oob_sums = np.zeros(len(dataY), dtype=float)
+            self.oob_counts = np.zeros(len(dataY), dtype=np.int64)
+
+    def add_oob_predictions(
+        self, oob_indexes: np.ndarray, oob_predictions: np.ndarray
+    ) -> None:
+        """Records one bag's out-of-bag rows and adds its predictions
+        for them to the accumulators.
+        Parameters:
+            oob_indexes (np.ndarray): Rows left out of the bag's bootstrap.
+            oob_predictions (np.ndarray): The bag's predictions for those rows.
+        Returns:
+            None
+        """
+        self.oob_indexes.append(oob_indexes)
+
+        if self.classifier:
+            class_indexes = np.searchsorted(self.classes, oob_predictions)
+            np.add.at(self.oob_votes, (oob_indexes, class_indexes), 1)
+        else:
+            self.oob_sums[oob_indexes] += oob_predictions
+            self.oob_counts[oob_indexes] += 1
+
+    def oob_predictions(self) -> tuple[np.ndarray, np.ndarray]:
+        """Aggregates the out-of-bag predictions made so far.
+        Returns:
+            tuple[np.ndarray, np.ndarray]: True values, predicted values,
+            for every training row left out of at least one bag.
+        """
+        if self.classifier:
+            covered = self.oob_votes.sum(axis=1) > 0
+            predictions = self.classes[np.argmax(self.oob_votes[covered], axis=1)]
+        else:
+            covered = self.oob_counts > 0
+            predictions = self.oob_sums[covered] / self.oob_counts[covered]
+
+        return self.oob_y[covered], predictions
+
+    def oob_score(self) -> float:
+        """Scores the ensemble on its out-of-bag predictions, higher is better.
+        Returns:
+            float: Accuracy for classifiers, negative Root Mean Squared Error otherwise
+        """
+        y_true, y_pred = self.oob_predictions()
+
+        if len(y_true) == 0:
+            return np.nan
+
+        if self.classifier:
+            return float(accuracy_score(y_true, y_pred))
+
+        return -float(root_mean_squared_error(y_true, y_pred))
+
+    def query(self, points: pd.DataFrame | np.ndarray | list[dict]) -> np.ndarray:
         """Make predictions for given input points.
         Parameters:
-            points (list[dict]): Data points to predict.
+            points (pd.DataFrame | np.ndarray | list[dict]): Data points to predict,
+                2-D arrays having their columns ordered as the learners' features.
         Returns:
             numpy.ndarray: Predicted values for the input data.
         """
+        return self.query_matrix(feature_matrix(points, self.learners[0].features))
 
-        predictions = np.array([learner.query(points) for learner in self.learners])
+    def query_matrix(self, dataX: np.ndarray) -> np.ndarray:
+        """Make predictions for a 2-D feature matrix, chunk_size rows at a time.
+        Classifiers predict the most voted class, ties going to the lowest class.
+        Parameters:
+            dataX (numpy.ndarray): Feature matrix, columns ordered as the learners' features.
+        Returns:
+            numpy.ndarray: Predicted values for the input data.
+        """
+        predictions = np.empty(len(dataX), dtype=float)
 
-        if self.classifier:
-            most_common = mode(predictions, axis=0).mode
-            return most_common
+        for start in range(0, len(dataX), self.chunk_size):
+            chunk = dataX[start : start + self.chunk_size]
+
+            if self.classifier:
+                votes = self.vote(chunk)
+                predictions[start : start + len(chunk)] = self.classes[
+                    np.argmax(votes, axis=1)
+                ]
+                continue
+
+            total = np.zeros(len(chunk), dtype=float)
+            for learner in self.learners:
+                total += learner.query_matrix(chunk)
 
-        averaged_predictions = np.mean(predictions, axis=0)
+            predictions[start : start + len(chunk)] = total / len(self.learners)
 
-        return averaged_predictions
+        return predictions
+
+    def predict_proba(
+        self, points: pd.DataFrame | np.ndarray | list[dict]
+    ) -> np.ndarray:
+        """Estimates class probabilities for given input points as the
+        fraction of learners voting for each class.
+        Parameters:
+            points (pd.DataFrame | np.ndarray | list[dict]): Data points to predict,
+                2-D arrays having their columns ordered as the learners' features.
+        Returns:
+            numpy.ndarray: One row per point, one column per class in self.classes.
+        """
+        return self.predict_proba_matrix(
+            feature_matrix(points, self.learners[0].features)
+        )
+
+    def predict_proba_matrix(self, dataX: np.ndarray) -> np.ndarray:
+        """Estimates class probabilities for a 2-D feature matrix, chunk_size rows at a time.
+        Parameters:
+            dataX (numpy.ndarray): Feature matrix, columns ordered as the learners' features.
+        Returns:
+            numpy.ndarray: One row per point, one column per class in self.classes.
+        """
+        if not self.classifier:
+            raise ValueError("Class probabilities require a classification model.")
+
+        probabilities = np.empty((len(dataX), len(self.classes)), dtype=float)
+
+        for start in range(0, len(dataX), self.chunk_size):
+            chunk = dataX[start : start + self.chunk_size]
+            probabilities[start : start + len(chunk)] = self.vote(chunk) / len(
+                self.learners
+            )
+
+        return probabilities
+
+    def vote(self, dataX: np.ndarray) -> np.ndarray:
+        """Counts each learner's predicted class for every row.
+        Parameters:
+            dataX (numpy.ndarray): Feature matrix, columns ordered as the learners' features.
+        Returns:
+            numpy.ndarray: Number of votes, one row per point, one column per class in self.classes.
+        """
+        if len(self.classes) == 0:
+            # Ensembles saved without their classes still hold them in their leaves
+            self.classes = np.unique(
+                np.concatenate(
+                    [learner.value[learner.feature < 0] for learner in self.learners]
+                )
+            )
+
+        class_count = len(self.classes)
+        offsets = np.arange(len(dataX)) * class_count
+
+        votes = np.zeros(len(dataX) * class_count, dtype=np.int64)
+
+        for learner in self.learners:
+            class_indexes = np.searchsorted(self.classes, learner.query_matrix(dataX))
+            votes += np.bincount(offsets + class_indexes, minlength=len(votes))
+
+        return votes.reshape(len(dataX), class_count)
+
+    def save(self, path: str, float32: bool = False) -> None:
+        """Saves the trained ensemble to a single uncompressed .npz file.
+        Parameters:
+            path (str): Path of the file to write.
+            float32 (bool=False): Whether to store thresholds and leaf values as float32.
+        Returns:
+            None
+        """
+        save_trees(
+            path,
+            self.learners,
+            float32,
+            seed=self.seed,
+            seed_entropy=self.seed_sequence.entropy,
+            seeds_spawned=self.seed_sequence.n_children_spawned,
+            classes=self.classes.tolist(),
+            oob_tolerance=self.oob_tolerance,
+            oob_window=self.oob_window,
+        )
+
+    @staticmethod
+    def load(path: str, mmap: bool = False, float32: bool = False) -> "BagLearner":
+        """Loads an ensemble saved by BagLearner.save.
+        Parameters:
+            path (str): Path of the file to read.
+            mmap (bool=False): Whether to memory-map the node arrays, letting
+                               every process that loads the file share its pages.
+            float32 (bool=False): Whether to use float32 thresholds and leaf values.
+        Returns:
+            BagLearner: The trained ensemble.
+        """
+        trees, metadata = load_trees(path, mmap, float32)
+
+        bag_learner = BagLearner(
+            LEARNER_TYPES[metadata["learner"]],
+            0,
+            metadata["classifier"],
+            seed=metadata.get("seed"),
+            oob_tolerance=metadata.get("oob_tolerance"),
+            oob_window=metadata.get("oob_window", 10),
+            leaf_size=metadata["leaf_size"],
+            bins=metadata.get("bins"),
+        )
+        bag_learner.learners = trees
+        bag_learner.classes = np.array(metadata.get("classes", []), dtype=float)
+
+        if "seed_entropy" in metadata:
+            bag_learner.seed_sequence = np.random.SeedSequence(
+                metadata["seed_entropy"], n_children_spawned=metadata["seeds_spawned"]
+            )
+
+        return bag_learner
 
     def generate_regression_stats(
         self, y_true: pd.Series, y_pred: np.ndarray
@@ -101,6 +570,22 @@ class BagLearner:
             y_true, y_pred
         )
 
+    def generate_oob_stats(self) -> tuple[float, float]:
+        """Estimates generalization from the out-of-bag predictions of the
+        last training run, without a separate test set.
+        Returns:
+            tuple[float, float]: Accuracy Score, F1 Score for classifiers,
+            Root Mean Squared Error, Mean Absolute Error otherwise
+        """
+        y_true, y_pred = self.oob_predictions()
+
+        if self.classifier:
+            return accuracy_score(y_true, y_pred), f1_score(
+                y_true, y_pred, average="weighted"
+            )
+
+        return self.generate_regression_stats(cast(pd.Series, y_true), y_pred)
+
     def generate_classification_stats(
         self, y_true: pd.Series, y_pred: np.ndarray
     ) -> tuple[float, float, float, float, np.ndarray]:
@@ -1,148 +1,322 @@
-from typing import Any, List, cast
+from typing import List
 import pandas as pd
 import numpy as np
 from pandas.core.algorithms import nunique_ints
+from learners.utils import feature_matrix, quantize_features
 
 np.seterr(divide="ignore", invalid="ignore")
 
 
 class DTLearner:
-    def __init__(self, leaf_size=1, verbose=False, classifier=False):
-        """Constructor"""
+    def __init__(
+        self, leaf_size=1, verbose=False, classifier=False, seed=None, bins=None
+    ):
+        """Constructor
+        bins: If set, features are quantized into at most this many bins (up to 256)
+        before training, and splits are chosen from per-bin histograms."""
         self.leaf_size = leaf_size
-        self.tree: List[str | float | List[str | float | List[Any]]] = []
         self.max_depth = 5
         self.classifier = classifier
+        self.rng = np.random.default_rng(seed)
+        self.bins = bins
+        self.features: List[str] = []
+        # Node arrays, a node with a feature index of -1 is a leaf
+        self.feature = np.empty(0, dtype=np.int64)
+        self.threshold = np.empty(0, dtype=float)
+        self.left = np.empty(0, dtype=np.int64)
+        self.right = np.empty(0, dtype=np.int64)
+        self.value = np.empty(0, dtype=float)
+        self._nodes: List[tuple[int, float, int, int, float]] = []
+
+    def build_leaf(self, dataY: np.ndarray) -> int:
+        """Appends a leaf node holding the prediction for the given targets.
+        Parameters:
+            dataY (numpy.ndarray): Target values reaching the leaf.
+        Returns:
+            int: Index of the new node
+        """
+        if self.classifier:
+            unique, counts = np.unique(dataY, return_counts=True)
+            index = np.argmax(counts)
+            leaf_value = float(unique[index])
+        else:
+            leaf_value = float(dataY.mean())
+
+        self._nodes.append((-1, np.nan, -1, -1, leaf_value))
+        return len(self._nodes) - 1
 
     def build_tree(
-        self, dataX: pd.DataFrame, dataY: pd.Series, depth=0
-    ) -> List[str | float | List[str | float | List[Any]]]:
-        """Recursively builds the decision tree.
+        self, dataX: np.ndarray, dataY: np.ndarray, rows: np.ndarray, depth=0
+    ) -> int:
+        """Recursively builds the decision tree, appending its nodes in
+        preorder to the node list. Each node only holds a slice of the
+        row index buffer, which is partitioned in place between its children.
         Parameters:
-            dataX (pd.DataFrame): Feature matrix for training.
-            dataY (pd.Series): Target values for training.
+            dataX (numpy.ndarray): Complete feature matrix for training.
+            dataY (numpy.ndarray): Complete target values for training.
+            rows (numpy.ndarray): Indexes of the rows reaching this node.
         Returns:
-            List[str | float | List[str | float | List[Any]]]: The complete Decision Tree
+            int: Index of the subtree's root node
         """
+        node_x = dataX[rows]
+        node_y = dataY[rows]
 
-        if (depth >= self.max_depth or len(dataX) <= self.leaf_size) or (
-            dataX.nunique().max() == 1 or dataY.nunique() == 1
+        if (depth >= self.max_depth or len(rows) <= self.leaf_size) or (
+            (node_x == node_x[0]).all() or (node_y == node_y[0]).all()
         ):
             # Base Case Reached, Create Leaf Node
-            if self.classifier:
-                unique, counts = np.unique(dataY, return_counts=True)
-                index = np.argmax(counts)
-                most_common = unique[index]
-                return [f"Leaf: {most_common}"]
-            return [f"Leaf: {dataY.mean()}"]
+            return self.build_leaf(node_y)
 
-        feature, split_val = self.select_split_feature(dataX, dataY)
+        feature, split_val = self.select_split_feature(node_x, node_y)
 
-        left_data = dataX[dataX[feature] <= split_val]
+        goes_left = node_x[:, feature] <= split_val
+        left_count = int(np.count_nonzero(goes_left))
 
-        left_target = dataY[left_data.index]
+        # In the event that a split results in 0 data points on one of the subtrees
+        if left_count == 0 or left_count == len(rows):
+            return self.build_leaf(node_y)
 
-        right_data = dataX[dataX[feature] > split_val]
-        right_target = dataY[right_data.index]
+        # Partition the node's rows so each child owns a contiguous slice
+        rows[:] = np.concatenate((rows[goes_left], rows[~goes_left]))
 
-        # In the event that a split results in 0 data points on one of the subtrees
-        if len(left_data) == 0 or len(right_data) == 0:
-            if self.classifier:
-                unique, counts = np.unique(dataY, return_counts=True)
-                index = np.argmax(counts)
-                most_common = unique[index]
-                return [f"Leaf: {most_common}"]
-            return [f"Leaf: {dataY.mean()}"]
+        # Reserve the node's slot so children are stored after their parent
+        node = len(self._nodes)
+        self._nodes.append((-1, np.nan, -1, -1, np.nan))
 
-        left_data = cast(pd.DataFrame, left_data)  # For Linting Purposes
-        left_target = cast(pd.Series, left_target)  # For Linting Purposes
-        right_data = cast(pd.DataFrame, right_data)  # For Linting Purposes
-        right_target = cast(pd.Series, right_target)  # For Linting Purposes
+        left_tree = self.build_tree(dataX, dataY, rows[:left_count], depth + 1)
+        right_tree = self.build_tree(dataX, dataY, rows[left_count:], depth + 1)
 
-        left_tree = self.build_tree(left_data, left_target, depth + 1)
-        right_tree = self.build_tree(right_data, right_target, depth + 1)
+        self._nodes[node] = (feature, split_val, left_tree, right_tree, np.nan)
 
-        return [feature, split_val, left_tree, right_tree]
+        return node
 
     def add_evidence(self, dataX: pd.DataFrame, dataY: pd.Series):
         """Train the model with provided data.
         Parameters:
-            data_x (numpy.ndarray): Feature matrix for training.
-            data_y (numpy.ndarray): Target values for training.
+            dataX (pd.DataFrame): Feature matrix for training.
+            dataY (pd.Series): Target values for training.
         Returns:
             None
         """
-        self.tree = self.build_tree(dataX, dataY)
+        self.features = [str(column) for column in dataX.columns]
+
+        self.add_evidence_matrix(
+            np.ascontiguousarray(dataX.to_numpy(dtype=float)),
+            np.asarray(dataY, dtype=float),
+        )
+
+    def build_binned_tree(
+        self, codes: np.ndarray, dataY: np.ndarray, rows: np.ndarray, depth=0
+    ) -> int:
+        """Recursively builds the decision tree from quantized features,
+        like build_tree, choosing splits from per-bin histograms.
+        Parameters:
+            codes (numpy.ndarray): Complete matrix of feature bins for training.
+            dataY (numpy.ndarray): Complete target values for training.
+            rows (numpy.ndarray): Indexes of the rows reaching this node.
+        Returns:
+            int: Index of the subtree's root node
+        """
+        node_codes = codes[rows]
+        node_y = dataY[rows]
+
+        if (depth >= self.max_depth or len(rows) <= self.leaf_size) or (
+            (node_codes == node_codes[0]).all() or (node_y == node_y[0]).all()
+        ):
+            # Base Case Reached, Create Leaf Node
+            return self.build_leaf(node_y)
+
+        feature, split_bin = self.select_split_bin(node_codes, node_y)
+
+        goes_left = node_codes[:, feature] <= split_bin
+        left_count = int(np.count_nonzero(goes_left))
+
+        # In the event that a split results in 0 data points on one of the subtrees
+        if left_count == 0 or left_count == len(rows):
+            return self.build_leaf(node_y)
+
+        # Partition the node's rows so each child owns a contiguous slice
+        rows[:] = np.concatenate((rows[goes_left], rows[~goes_left]))
+
+        # Reserve the node's slot so children are stored after their parent
+        node = len(self._nodes)
+        self._nodes.append((-1, np.nan, -1, -1, np.nan))
+
+        left_tree = self.build_binned_tree(codes, dataY, rows[:left_count], depth + 1)
+        right_tree = self.build_binned_tree(codes, dataY, rows[left_count:], depth + 1)
+
+        # Thresholds are stored as raw values, so querying never needs the bins
+        split_val = float(self._bin_edges[feature, split_bin])
+
+        self._nodes[node] = (feature, split_val, left_tree, right_tree, np.nan)
+
+        return node
+
+    def add_evidence_matrix(
+        self,
+        dataX: np.ndarray,
+        dataY: np.ndarray,
+        rows: np.ndarray | None = None,
+        binned: tuple[np.ndarray, np.ndarray, np.ndarray] | None = None,
+    ):
+        """Train the model on the given rows of a float feature matrix,
+        whose columns are ordered as self.features.
+        Parameters:
+            dataX (numpy.ndarray): Feature matrix for training.
+            dataY (numpy.ndarray): Target values for training.
+            rows (numpy.ndarray | None): Indexes of the training rows, all rows if None.
+            binned (tuple | None): Output of quantize_features for dataX, computed
+                                   here when self.bins is set and it is None.
+        Returns:
+            None
+        """
+        if rows is None:
+            rows = np.arange(len(dataX))
+
+        # Position of each feature in alphabetical order, used for tie breaking
+        self._feature_rank = np.argsort(np.argsort(self.features, kind="stable"))
+        self._nodes = []
+
+        if self.bins is None:
+            self.build_tree(dataX, dataY, np.array(rows, dtype=np.int64))
+        else:
+            if binned is None:
+                binned = quantize_features(dataX, self.bins)
+
+            codes, self._bin_edges, self._bin_values = binned
+
+            self.build_binned_tree(codes, dataY, np.array(rows, dtype=np.int64))
 
-    def query(self, points: list[dict]) -> np.ndarray:
+            del self._bin_edges, self._bin_values
+
+        feature, threshold, left, right, value = zip(*self._nodes)
+        self.feature = np.array(feature, dtype=np.int64)
+        self.threshold = np.array(threshold, dtype=float)
+        self.left = np.array(left, dtype=np.int64)
+        self.right = np.array(right, dtype=np.int64)
+        self.value = np.array(value, dtype=float)
+        self._nodes = []
+
+    def query(self, points: pd.DataFrame | np.ndarray | list[dict]) -> np.ndarray:
         """Make predictions for given input points.
         Parameters:
-            points (list[dict]): Data points to predict.
+            points (pd.DataFrame | numpy.ndarray | list[dict]): Data points to predict,
+                2-D arrays having their columns ordered as self.features.
         Returns:
             numpy.ndarray: Predicted values for the input data.
         """
-        predictions = []
-
-        for point in points:
-            tree = self.tree
-            while True:
-                if isinstance(cast(list, tree)[0], str) and cast(
-                    str, tree[0]
-                ).startswith("Leaf:"):
-                    break
-
-                tree = cast(
-                    List[str | float | List[str | float | List[Any]]], tree
-                )  # For Linting Purposes
-                feature = cast(str, tree[0])  # For Linting Purposes
-                split_val = cast(float, tree[1])  # For Linting Purposes
-
-                if point[feature] <= split_val:
-                    # Move Left
-                    tree = tree[2]
-                else:
-                    # Move Right
-                    tree = tree[3]
-
-            predictions.append(
-                float(cast(str, cast(list, tree)[0]).replace("Leaf: ", ""))
-            )
+        return self.query_matrix(feature_matrix(points, self.features))
+
+    def query_matrix(self, dataX: np.ndarray) -> np.ndarray:
+        """Make predictions for a 2-D feature matrix, routing every row
+        down the tree one level at a time.
+        Parameters:
+            dataX (numpy.ndarray): Feature matrix, columns ordered as self.features.
+        Returns:
+            numpy.ndarray: Predicted values for the input data.
+        """
+        nodes = np.zeros(len(dataX), dtype=np.int64)
+        active = np.arange(len(dataX))
+
+        while active.size > 0:
+            current = nodes[active]
+            feature = self.feature[current]
 
-        return np.array(predictions, dtype=float)
+            # Rows that reached a leaf stop moving
+            internal = feature >= 0
+            active = active[internal]
+            current = current[internal]
+            feature = feature[internal]
+
+            go_left = dataX[active, feature] <= self.threshold[current]
+            nodes[active] = np.where(go_left, self.left[current], self.right[current])
+
+        return self.value[nodes]
 
     def select_split_feature(
-        self, dataX: pd.DataFrame, dataY: pd.Series
-    ) -> tuple[str, float]:
+        self, dataX: np.ndarray, dataY: np.ndarray
+    ) -> tuple[int, float]:
         """Select the best feature based on correlation between feature and target.
         Ties broken based on alphabetical order.
         Parameters:
-            dataX (pd.DataFrame): Feature matrix for training.
-            dataY (pd.DataFrame): Target values for training.
+            dataX (numpy.ndarray): Feature matrix of the node's rows.
+            dataY (numpy.ndarray): Target values of the node's rows.
         Returns:
-            tuple[str, float]: Feature label, split value
+            tuple[int, float]: Feature index, split value
         """
 
-        correlations = dataX.apply(lambda x: x.corr(dataY))
+        # Pearson correlation of every column with the target at once
+        centered_x = dataX - dataX.mean(axis=0)
+        centered_y = dataY - dataY.mean()
 
-        correlations = cast(pd.DataFrame, correlations)  # For Linting Purposes
+        correlations = np.abs(
+            (centered_x * centered_y[:, None]).sum(axis=0)
+            / np.sqrt((centered_x**2).sum(axis=0) * (centered_y**2).sum())
+        )
 
-        tied_features = correlations[
-            correlations.abs() == correlations.abs().max()
-        ].index.tolist()
+        tied_features = np.flatnonzero(correlations == np.nanmax(correlations))
 
         # Alphabetical Tie Breaking
 
-        sorted_features = sorted(tied_features)
+        best_feature = int(tied_features[np.argmin(self._feature_rank[tied_features])])
+
+        # Splitting Data by Median
 
-        # print(sorted_features)
+        split_val = float(np.median(dataX[:, best_feature]))
 
-        best_feature = sorted_features[0]
+        return best_feature, split_val
 
-        # Splitting Data by Median
+    def select_split_bin(self, codes: np.ndarray, dataY: np.ndarray) -> tuple[int, int]:
+        """Select the best feature based on correlation between feature and target,
+        estimated from per-bin counts and sums, with each value replaced by
+        its bin's mean value. Ties broken based on alphabetical order.
+        Parameters:
+            codes (numpy.ndarray): Feature bins of the node's rows.
+            dataY (numpy.ndarray): Target values of the node's rows.
+        Returns:
+            tuple[int, int]: Feature index, last bin of the left subtree
+        """
+        bins = self._bin_values.shape[1]
 
-        split_val = dataX[best_feature].median()
+        counts = np.empty((codes.shape[1], bins))
+        sums = np.empty((codes.shape[1], bins))
 
-        split_val = cast(float, split_val)  # For Linting Purposes
-        best_feature = cast(str, best_feature)  # For Linting Purposes
+        for feature in range(codes.shape[1]):
+            counts[feature] = np.bincount(codes[:, feature], minlength=bins)
+            sums[feature] = np.bincount(
+                codes[:, feature], weights=dataY, minlength=bins
+            )
 
-        return best_feature, split_val
+        count = len(dataY)
+        sum_x = (counts * self._bin_values).sum(axis=1)
+        sum_xx = (counts * self._bin_values**2).sum(axis=1)
+        sum_xy = (sums * self._bin_values).sum(axis=1)
+        sum_y = dataY.sum()
+
+        covariance = sum_xy - sum_x * sum_y / count
+        variance_x = sum_xx - sum_x**2 / count
+        variance_y = (dataY**2).sum() - sum_y**2 / count
+
+        correlations = np.abs(covariance / np.sqrt(variance_x * variance_y))
+
+        # Features whose rows all share one bin cannot be split
+        correlations[(counts > 0).sum(axis=1) <= 1] = np.nan
+
+        tied_features = np.flatnonzero(correlations == np.nanmax(correlations))
+
+        # Alphabetical Tie Breaking
+
+        best_feature = int(tied_features[np.argmin(self._feature_rank[tied_features])])
+
+        # Splitting Data by Median Bin
+
+        return best_feature, self.median_bin(counts[best_feature])
+
+    def median_bin(self, counts: np.ndarray) -> int:
+        """Finds the bin holding the median of a feature's histogram.
+        Parameters:
+            counts (numpy.ndarray): Number of rows in each bin.
+        Returns:
+            int: Index of the median bin
+        """
+        return int(np.searchsorted(np.cumsum(counts), counts.sum() / 2))
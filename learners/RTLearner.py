@@ -1,29 +1,42 @@
-from typing import cast
 import numpy as np
-import pandas as pd
 from .DTLearner import DTLearner
 
 
 class RTLearner(DTLearner):
     def select_split_feature(
-        self, dataX: pd.DataFrame, dataY: pd.Series
-    ) -> tuple[str, float]:
+        self, dataX: np.ndarray, dataY: np.ndarray
+    ) -> tuple[int, float]:
         """Randomly selects a feature, and splits the data
         based on median.
         Parameters:
-            dataX (pd.DataFrame): Feature matrix for training.
-            dataY (pd.DataFrame): Target values for training.
+            dataX (numpy.ndarray): Feature matrix of the node's rows.
+            dataY (numpy.ndarray): Target values of the node's rows.
         Returns:
-            tuple[str, float]: Feature label, split value
+            tuple[int, float]: Feature index, split value
         """
         # Randomly Select Feature
-        feature = dataX.columns.to_series().sample(n=1).iloc[0]
+        feature = int(self.rng.integers(dataX.shape[1]))
 
         # Splitting Data by Median
 
-        split_val = dataX[feature].median()
-
-        split_val = cast(float, split_val)  # For Linting Purposes
-        feature = cast(str, feature)  # For Linting Purposes
+        split_val = float(np.median(dataX[:, feature]))
 
         return feature, split_val
+
+    def select_split_bin(self, codes: np.ndarray, dataY: np.ndarray) -> tuple[int, int]:
+        """Randomly selects a feature, and splits the data
+        based on its median bin.
+        Parameters:
+            codes (numpy.ndarray): Feature bins of the node's rows.
+            dataY (numpy.ndarray): Target values of the node's rows.
+        Returns:
+            tuple[int, int]: Feature index, last bin of the left subtree
+        """
+        # Randomly Select Feature
+        feature = int(self.rng.integers(codes.shape[1]))
+
+        # Splitting Data by Median Bin
+
+        counts = np.bincount(codes[:, feature], minlength=self._bin_values.shape[1])
+
+        return feature, self.median_bin(counts)
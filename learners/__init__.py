@@ -1,4 +1,6 @@
 from .BagLearner import BagLearner
 from .DTLearner import DTLearner
 from .RTLearner import RTLearner
-from .utils import split_time_series
+from .persistence import load_trees, save_trees
+from .utils import label_columns, split_time_series, walk_forward_splits
+from .backtest import walk_forward
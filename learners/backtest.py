@@ -0,0 +1,175 @@
+import os
+from contextlib import nullcontext
+from itertools import starmap
+from multiprocessing import Pool
+from typing import Any, Dict, Type
+import numpy as np
+import pandas as pd
+from learners.BagLearner import BagLearner
+from learners.DTLearner import DTLearner
+from learners.utils import label_columns, walk_forward_splits
+
+# Dataset shared by every fold, set once per worker process
+_shared_data: tuple[np.ndarray, np.ndarray, list[str]] = (
+    np.empty((0, 0)),
+    np.empty(0),
+    [],
+)
+
+
+def _share_data(dataX: np.ndarray, dataY: np.ndarray, features: list[str]) -> None:
+    """Stores the dataset for the folds evaluated by this process.
+    Parameters:
+        dataX (np.ndarray): Feature matrix of the whole dataset.
+        dataY (np.ndarray): Target values of the whole dataset.
+        features (list[str]): Labels of the feature matrix's columns.
+    Returns:
+        None
+    """
+    global _shared_data
+    _shared_data = (dataX, dataY, features)
+
+
+def _evaluate_fold(
+    learner: Type[DTLearner],
+    bags: int,
+    classifier: bool,
+    seed: int | None,
+    kwargs: Dict[str, Any],
+    fold: tuple[int, int, int, int],
+) -> Dict[str, Any]:
+    """Trains a BagLearner on one fold's training rows and scores it on
+    its testing rows. Both are row ranges of the shared matrix, so no fold
+    copies the dataset. Defined at module level so it can be sent to
+    worker processes.
+    Parameters:
+        learner (Type[DTLearner]): The type of learner to bag.
+        bags (int): The number of bags to create.
+        classifier (bool): Whether the BagLearner is a classification model.
+        seed (int | None): Master seed of the BagLearner.
+        kwargs (Dict[str, Any]): Keyworded arguments to pass to the BagLearner.
+        fold (tuple[int, int, int, int]): Train start, train end, test start and test end positions.
+    Returns:
+        Dict[str, Any]: The fold's metrics.
+    """
+    dataX, dataY, features = _shared_data
+    train_start, train_end, test_start, test_end = fold
+
+    bag_learner = BagLearner(learner, bags, classifier, seed=seed, **kwargs)
+    bag_learner.add_evidence_matrix(
+        dataX[train_start:train_end], dataY[train_start:train_end], features
+    )
+
+    y_true = dataY[test_start:test_end]
+    y_pred = bag_learner.query_matrix(dataX[test_start:test_end])
+
+    metrics: Dict[str, Any] = {"bags": len(bag_learner.learners)}
+
+    if classifier:
+        accuracy, precision, f1, recall, _ = bag_learner.generate_classification_stats(
+            pd.Series(y_true), y_pred
+        )
+        metrics.update(accuracy=accuracy, precision=precision, f1=f1, recall=recall)
+    else:
+        rmse, mae = bag_learner.generate_regression_stats(pd.Series(y_true), y_pred)
+        metrics.update(rmse=rmse, mae=mae)
+
+    return metrics
+
+
+def walk_forward(
+    df: pd.DataFrame,
+    learner: Type[DTLearner],
+    bags: int,
+    train_size: int,
+    test_size: int,
+    step: int | None = None,
+    expanding: bool = True,
+    classifier: bool = True,
+    target: str = "Signal",
+    n_jobs: int | None = 1,
+    seed: int | None = None,
+    **kwargs: Any,
+) -> pd.DataFrame:
+    """
+    Evaluates a BagLearner over walk-forward folds of a dataset built by Builder.build.
+    The dataset is converted to a float matrix once and handed to each worker process
+    once, every fold then trains and tests on row ranges of that matrix.
+    Raises a ValueError when the fold sizes leave no rows to test.
+
+    Args:
+        df (pd.DataFrame): The time series dataset, with a numeric target column.
+        learner (Type[DTLearner]): The type of learner to bag.
+        bags (int): The number of bags each fold's BagLearner creates.
+        train_size (int): Number of rows in the first fold's training set.
+        test_size (int): Number of rows in each fold's testing set.
+        step (int | None): Number of rows the folds move forward by, defaults to test_size.
+        expanding (bool): Whether training sets grow from the first row, or roll forward.
+        classifier (bool): Whether the BagLearner is a classification model.
+        target (str): Name of the target column, other label columns are dropped.
+        n_jobs (int | None): Number of worker processes evaluating folds, None uses every core.
+        seed (int | None): Master seed of every fold's BagLearner.
+        **kwargs (Any): Keyworded arguments to pass to the BagLearners.
+
+    Returns:
+        pd.DataFrame: One row per fold, with its date range, sizes and metrics.
+    """
+    labels = label_columns(df) + [target]
+    features = [str(column) for column in df.columns if column not in labels]
+
+    dataX = np.ascontiguousarray(df[features].to_numpy(dtype=float))
+    dataY = df[target].to_numpy(dtype=float)
+
+    folds = walk_forward_splits(len(df), train_size, test_size, step, expanding)
+
+    if len(folds) == 0:
+        raise ValueError(
+            f"A training size of {train_size} leaves none of the {len(df)} rows to test."
+        )
+
+    tasks = [(learner, bags, classifier, seed, kwargs, fold) for fold in folds]
+
+    if n_jobs is None:
+        n_jobs = os.cpu_count() or 1
+
+    parallel = n_jobs > 1 and len(tasks) > 1
+    if not parallel:
+        _share_data(dataX, dataY, features)
+
+    try:
+        with (
+            Pool(
+                min(n_jobs, len(tasks)),
+                initializer=_share_data,
+                initargs=(dataX, dataY, features),
+            )
+            if parallel
+            else nullcontext()
+        ) as pool:
+            results = (
+                pool.starmap(_evaluate_fold, tasks)
+                if pool is not None
+                else list(starmap(_evaluate_fold, tasks))
+            )
+    finally:
+        if not parallel:
+            _share_data(np.empty((0, 0)), np.empty(0), [])
+
+    rows = []
+
+    for fold_number, (fold, metrics) in enumerate(zip(folds, results)):
+        train_start, train_end, test_start, test_end = fold
+        rows.append(
+            {
+                "fold": fold_number,
+                "train_start": df.index[train_start],
+                "train_end": df.index[train_end - 1],
+                "test_start": df.index[test_start],
+                "test_end": df.index[test_end - 1],
+                "train_rows": train_end - train_start,
+                "test_rows": test_end - test_start,
+                **metrics,
+            }
+        )
+
+    return pd.DataFrame(rows).set_index("fold")
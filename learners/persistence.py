@@ -0,0 +1,206 @@
+import json
+import os
+import struct
+import tempfile
+import zipfile
+from typing import Any, Dict, List, Tuple, Type
+import numpy as np
+from learners.DTLearner import DTLearner
+from learners.RTLearner import RTLearner
+
+LEARNER_TYPES: Dict[str, Type[DTLearner]] = {
+    "DTLearner": DTLearner,
+    "RTLearner": RTLearner,
+}
+
+# Size of the fixed part of a zip local file header
+_ZIP_LOCAL_HEADER_SIZE = 30
+
+
+def load_npz(path: str, mmap: bool = False) -> Dict[str, np.ndarray]:
+    """Loads every array of an .npz file. np.load ignores mmap_mode for
+    .npz files, so when mmap is set the arrays of an uncompressed archive
+    are memory-mapped directly from their offsets within the zip.
+    Parameters:
+        path (str): Path of the .npz file.
+        mmap (bool=False): Whether to memory-map the arrays read-only.
+    Returns:
+        Dict[str, np.ndarray]: Arrays by name.
+    """
+    if not mmap:
+        with np.load(path) as archive:
+            return {name: archive[name] for name in archive.files}
+
+    arrays = {}
+
+    with zipfile.ZipFile(path) as archive, open(path, "rb") as file:
+        for info in archive.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(
+                    f"{info.filename} is compressed and cannot be memory-mapped."
+                )
+
+            file.seek(info.header_offset)
+            header = file.read(_ZIP_LOCAL_HEADER_SIZE)
+            name_length, extra_length = struct.unpack("<HH", header[26:30])
+            file.seek(
+                info.header_offset + _ZIP_LOCAL_HEADER_SIZE + name_length + extra_length
+            )
+
+            version = np.lib.format.read_magic(file)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(file)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(file)
+
+            name = info.filename.removesuffix(".npy")
+
+            if int(np.prod(shape)) == 0:
+                arrays[name] = np.empty(shape, dtype=dtype)
+                continue
+
+            arrays[name] = np.memmap(
+                path,
+                dtype=dtype,
+                mode="r",
+                offset=file.tell(),
+                shape=shape,
+                order="F" if fortran_order else "C",
+            )
+
+    return arrays
+
+
+def _narrow_thresholds(threshold: np.ndarray) -> np.ndarray:
+    """Converts split thresholds to float32, rounding up those that float32
+    can't hold exactly. Rows go left when their value is at most the
+    threshold, and thresholds are usually data values, so rounding down would
+    send rows equal to a threshold right instead.
+    Parameters:
+        threshold (np.ndarray): Split thresholds.
+    Returns:
+        np.ndarray: The thresholds as float32.
+    """
+    narrowed = np.asarray(threshold).astype(np.float32)
+    below = narrowed < threshold
+    narrowed[below] = np.nextafter(narrowed[below], np.float32(np.inf))
+    return narrowed
+
+
+def save_trees(
+    path: str, trees: List[DTLearner], float32: bool = False, **metadata: Any
+) -> None:
+    """Saves trained trees to a single uncompressed .npz file, stacking
+    their node arrays end to end, so the file can be memory-mapped.
+    Parameters:
+        path (str): Path of the file to write.
+        trees (List[DTLearner]): Trained trees, all of the same type and features.
+        float32 (bool=False): Whether to store thresholds and leaf values as float32.
+        **metadata (Any): JSON serializable values stored with the trees.
+    Returns:
+        None
+    """
+    float_type = np.float32 if float32 else np.float64
+
+    offsets = np.zeros(len(trees) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(tree.feature) for tree in trees])
+
+    first = trees[0] if trees else DTLearner()
+
+    metadata = {
+        "learner": type(first).__name__,
+        "classifier": first.classifier,
+        "leaf_size": first.leaf_size,
+        "max_depth": first.max_depth,
+        "bins": first.bins,
+        "features": first.features,
+        **metadata,
+    }
+
+    arrays = {
+        "offsets": offsets,
+        "metadata": np.array(json.dumps(metadata)),
+    }
+
+    for name, dtype in [
+        ("feature", np.int32),
+        ("threshold", np.float64),
+        ("left", np.int32),
+        ("right", np.int32),
+        ("value", float_type),
+    ]:
+        arrays[name] = np.concatenate(
+            [getattr(tree, name) for tree in trees] or [np.empty(0)]
+        ).astype(dtype)
+
+    if float32:
+        arrays["threshold"] = _narrow_thresholds(arrays["threshold"])
+
+    # Write a new file and move it over the old one, instead of truncating a
+    # file that loaded models may still have memory-mapped
+    directory = os.path.dirname(os.path.abspath(path))
+    descriptor, temp_path = tempfile.mkstemp(dir=directory, suffix=".npz.tmp")
+    try:
+        # mkstemp creates the file readable by its owner only, give it the mode
+        # of the file it replaces, or the one a new file would get otherwise,
+        # so processes running as other users can still load the model
+        if os.path.exists(path):
+            mode = os.stat(path).st_mode & 0o777
+        else:
+            umask = os.umask(0)
+            os.umask(umask)
+            mode = 0o666 & ~umask
+        os.chmod(temp_path, mode)
+
+        with os.fdopen(descriptor, "wb") as file:
+            np.savez(file, **arrays)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def load_trees(
+    path: str, mmap: bool = False, float32: bool = False
+) -> Tuple[List[DTLearner], Dict[str, Any]]:
+    """Loads trees saved by save_trees. Each tree's node arrays are views
+    into the stacked arrays, so memory-mapped trees share the file's pages
+    between every process that loads it.
+    Parameters:
+        path (str): Path of the file to read.
+        mmap (bool=False): Whether to memory-map the node arrays.
+        float32 (bool=False): Whether to use float32 thresholds and leaf values.
+                              Converting float64 arrays copies them out of the map.
+    Returns:
+        Tuple[List[DTLearner], Dict[str, Any]]: The trees, the stored metadata.
+    """
+    arrays = load_npz(path, mmap)
+
+    metadata = json.loads(str(arrays["metadata"]))
+
+    if float32:
+        if arrays["threshold"].dtype != np.float32:
+            arrays["threshold"] = _narrow_thresholds(arrays["threshold"])
+        if arrays["value"].dtype != np.float32:
+            arrays["value"] = arrays["value"].astype(np.float32)
+
+    learner_type = LEARNER_TYPES[metadata["learner"]]
+    offsets = arrays["offsets"]
+
+    trees = []
+
+    for start, end in zip(offsets[:-1], offsets[1:]):
+        tree = learner_type(
+            leaf_size=metadata["leaf_size"],
+            classifier=metadata["classifier"],
+            bins=metadata.get("bins"),
+        )
+        tree.max_depth = metadata["max_depth"]
+        tree.features = list(metadata["features"])
+
+        for name in ["feature", "threshold", "left", "right", "value"]:
+            setattr(tree, name, arrays[name][start:end])
+
+        trees.append(tree)
+
+    return trees, metadata
@@ -1,9 +1,28 @@
-from typing import Tuple
+from typing import List, Tuple
+import numpy as np
 import pandas as pd
 
 
+def label_columns(df: pd.DataFrame) -> List[str]:
+    """
+    Finds the label columns of a dataset, Signal or one Signal_<threshold>
+    column per threshold when labels were built for many thresholds.
+
+    Args:
+        df (pd.DataFrame): The dataset.
+
+    Returns:
+        List[str]: Names of the label columns.
+    """
+    return [
+        column
+        for column in df.columns
+        if column == "Signal" or str(column).startswith("Signal_")
+    ]
+
+
 def split_time_series(
-    df: pd.DataFrame, train_size: float = 0.8
+    df: pd.DataFrame, train_size: float = 0.8, target: str = "Signal"
 ) -> Tuple[pd.DataFrame, pd.Series, pd.DataFrame, pd.Series]:
     """
     Splits a time series dataframe into training and testing sets.
@@ -11,6 +30,7 @@ def split_time_series(
     Args:
         df (pd.DataFrame): The input time series dataframe.
         train_size (float): The proportion of the data to be used as the training set (default is 0.8 for 80%).
+        target (str): The label column to predict, other label columns are dropped.
 
     Returns:
         pd.DataFrame, pd.DataFrame: The training set and testing set.
@@ -18,13 +38,139 @@ def split_time_series(
     # Calculate the index for the split
     split_index = int(len(df) * train_size)
 
+    features = df.drop(columns=[c for c in label_columns(df) if c != target])
+
     # Split the dataframe into training and testing sets
-    train_set = df.iloc[:split_index]
+    train_set = features.iloc[:split_index]
 
-    train_y = train_set.pop("Signal")
+    train_y = train_set.pop(target)
 
-    test_set = df.iloc[split_index:]
+    test_set = features.iloc[split_index:]
 
-    test_y = test_set.pop("Signal")
+    test_y = test_set.pop(target)
 
     return train_set, train_y, test_set, test_y
+
+
+def walk_forward_splits(
+    length: int,
+    train_size: int,
+    test_size: int,
+    step: int | None = None,
+    expanding: bool = True,
+) -> List[Tuple[int, int, int, int]]:
+    """
+    Generates walk-forward train/test folds over a time series of a given length.
+
+    Args:
+        length (int): Number of rows in the time series.
+        train_size (int): Number of rows in the first fold's training set, and in
+                          every fold's training set when the window isn't expanding.
+        test_size (int): Number of rows in each fold's testing set.
+        step (int | None): Number of rows the folds move forward by, defaults to test_size.
+        expanding (bool): Whether training sets grow from the first row (default),
+                          or roll forward with a fixed size.
+
+    Returns:
+        List[Tuple[int, int, int, int]]: Train start, train end, test start and test end
+        positions of each fold, ends being exclusive.
+    """
+    if step is None:
+        step = test_size
+
+    if train_size <= 0 or test_size <= 0 or step <= 0:
+        raise ValueError("Fold sizes and step must be positive.")
+
+    folds = []
+
+    train_end = train_size
+
+    while train_end < length:
+        train_start = 0 if expanding else train_end - train_size
+        test_end = min(train_end + test_size, length)
+
+        folds.append((train_start, train_end, train_end, test_end))
+
+        train_end += step
+
+    return folds
+
+
+def quantize_features(
+    dataX: np.ndarray, bins: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Quantizes each column of a float feature matrix into at most bins quantile bins.
+    A value falls in bin b when edges[b - 1] < value <= edges[b].
+
+    Args:
+        dataX (np.ndarray): The float feature matrix.
+        bins (int): Maximum number of bins per feature, at most 256.
+
+    Returns:
+        np.ndarray, np.ndarray, np.ndarray: The uint8 bin of every value, the upper
+        edge of every feature's bins (padded with inf), and the mean value of every
+        feature's bins, used in place of raw values when computing correlations.
+    """
+    if not 2 <= bins <= 256:
+        raise ValueError("The number of bins must be between 2 and 256.")
+
+    codes = np.empty(dataX.shape, dtype=np.uint8)
+    edges = np.full((dataX.shape[1], bins), np.inf)
+    values = np.zeros((dataX.shape[1], bins))
+
+    quantiles = np.linspace(0, 1, bins + 1)[1:-1]
+
+    for feature in range(dataX.shape[1]):
+        column = dataX[:, feature]
+
+        feature_edges = np.unique(np.quantile(column, quantiles))
+        edges[feature, : len(feature_edges)] = feature_edges
+
+        codes[:, feature] = np.searchsorted(feature_edges, column, side="left")
+
+        counts = np.bincount(codes[:, feature], minlength=bins)
+        sums = np.bincount(codes[:, feature], weights=column, minlength=bins)
+        values[feature] = np.divide(sums, counts, out=values[feature], where=counts > 0)
+
+    return codes, edges, values
+
+
+def feature_matrix(
+    points: pd.DataFrame | np.ndarray | List[dict], features: List[str]
+) -> np.ndarray:
+    """
+    Converts data points to a float feature matrix with columns ordered as features.
+    DataFrame columns are matched to features by label once, 2-D arrays must
+    already be ordered as features.
+
+    Args:
+        points (pd.DataFrame | np.ndarray | List[dict]): The data points.
+        features (List[str]): Labels of the features, in the learner's order.
+
+    Returns:
+        np.ndarray: The feature matrix, one row per data point.
+    """
+    if isinstance(points, pd.DataFrame):
+        positions = pd.Index([str(column) for column in points.columns]).get_indexer(
+            features
+        )
+
+        if (positions < 0).any():
+            missing = [features[i] for i in np.flatnonzero(positions < 0)]
+            raise KeyError(f"Missing feature columns: {missing}.")
+
+        return points.iloc[:, positions].to_numpy(dtype=float)
+
+    if isinstance(points, np.ndarray):
+        if points.ndim != 2 or points.shape[1] != len(features):
+            raise ValueError(
+                f"Expected a 2-D array with {len(features)} columns, got shape {points.shape}."
+            )
+
+        return points.astype(float, copy=False)
+
+    return np.array(
+        [[point[feature] for feature in features] for point in points],
+        dtype=float,
+    ).reshape(len(points), len(features))
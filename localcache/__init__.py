@@ -0,0 +1 @@
+from .sqlite import CACHE_DIR, CoverageCache, SQLiteCache, cachePath
@@ -0,0 +1,185 @@
+import os
+import sqlite3
+from contextlib import closing, contextmanager
+from datetime import date
+from typing import Iterator, List, Tuple
+
+# Directory for cached data, overridable with the SDSP_CACHE_DIR environment variable
+CACHE_DIR = os.environ.get(
+    "SDSP_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "sdsp")
+)
+
+
+def cachePath(fileName: str) -> str:
+    """Builds the path of a file in CACHE_DIR, creating the directory if needed.
+
+    Args:
+        fileName (str): Name of the file.
+
+    Returns:
+        str: The file's path.
+    """
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    return os.path.join(CACHE_DIR, fileName)
+
+
+class SQLiteCache:
+    def __init__(self, path: str | None, fileName: str, schema: str):
+        """Opens (creating if needed) an SQLite file and its tables.
+
+        Args:
+            path (str | None): Path of the SQLite file, None for fileName in CACHE_DIR.
+            fileName (str): Name of the file in CACHE_DIR when no path is given.
+            schema (str): SQL creating the tables if they don't exist.
+
+        Returns:
+            None
+        """
+        self.path = cachePath(fileName) if path is None else path
+
+        with closing(self.connect()) as connection, connection:
+            connection.executescript(schema)
+
+    def connect(self) -> sqlite3.Connection:
+        """Opens a new connection, so the cache can be used from many threads.
+
+        Args:
+            None
+
+        Returns:
+            sqlite3.Connection: The connection, committing when used as a context manager.
+        """
+        return sqlite3.connect(self.path, timeout=30)
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Opens a connection holding the database's write lock until the
+        block ends, committing if it succeeds and rolling back otherwise,
+        so reads within the block can't be changed by other writers."""
+        with closing(self.connect()) as connection, connection:
+            connection.execute("BEGIN IMMEDIATE")
+            yield connection
+
+
+class CoverageCache(SQLiteCache):
+    # Column of the coverage table naming what a range was fetched for
+    keyColumn = "key"
+
+    def __init__(self, path: str | None, fileName: str, schema: str):
+        """Opens an SQLite cache that also records, for each key, the ranges
+        of days that have been fetched. Every range is half open, from its
+        first day up to but not including its end, and days from today on are
+        never recorded, since data for them may still change.
+
+        Args:
+            path (str | None): Path of the SQLite file, None for fileName in CACHE_DIR.
+            fileName (str): Name of the file in CACHE_DIR when no path is given.
+            schema (str): SQL creating the cache's other tables if they don't exist.
+
+        Returns:
+            None
+        """
+        super().__init__(
+            path,
+            fileName,
+            f"""
+            {schema}
+            CREATE TABLE IF NOT EXISTS coverage (
+                {self.keyColumn} TEXT NOT NULL,
+                start TEXT NOT NULL,
+                end TEXT NOT NULL
+            );
+            """,
+        )
+
+    def coverage(self, key: str) -> List[Tuple[date, date]]:
+        """Lists the ranges fetched for a key.
+
+        Args:
+            key (str): The key.
+
+        Returns:
+            List[Tuple[date, date]]: Sorted, non-overlapping ranges, as first day and end.
+        """
+        with closing(self.connect()) as connection:
+            return self._coverage(connection, key)
+
+    def missingRanges(
+        self, key: str, startDate: date, endDate: date
+    ) -> List[Tuple[date, date]]:
+        """Finds the parts of a range that haven't been fetched for a key.
+
+        Args:
+            key (str): The key.
+            startDate (date): First day of the range.
+            endDate (date): End of the range, the day after its last day.
+
+        Returns:
+            List[Tuple[date, date]]: The missing ranges, as first day and end.
+        """
+        missing = []
+        current = startDate
+
+        for coveredStart, coveredEnd in self.coverage(key):
+            if coveredEnd <= current:
+                continue
+            if coveredStart >= endDate:
+                break
+            if coveredStart > current:
+                missing.append((current, coveredStart))
+            current = coveredEnd
+
+        if current < endDate:
+            missing.append((current, endDate))
+
+        return missing
+
+    def markCovered(
+        self, connection: sqlite3.Connection, key: str, startDate: date, endDate: date
+    ) -> None:
+        """Records a fetched range, merging it with the key's other ranges. Must be
+        called within transaction(), so concurrent writers can't lose each other's ranges.
+
+        Args:
+            connection (sqlite3.Connection): The transaction's connection.
+            key (str): The key.
+            startDate (date): First day fetched.
+            endDate (date): End of the range fetched, the day after its last day.
+
+        Returns:
+            None
+        """
+        ranges = self._coverage(connection, key)
+
+        endDate = min(endDate, date.today())
+        if startDate < endDate:
+            ranges.append((startDate, endDate))
+
+        merged: List[Tuple[date, date]] = []
+        for rangeStart, rangeEnd in sorted(ranges):
+            if merged and rangeStart <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], rangeEnd))
+            else:
+                merged.append((rangeStart, rangeEnd))
+
+        connection.execute(f"DELETE FROM coverage WHERE {self.keyColumn} = ?", (key,))
+        connection.executemany(
+            f"INSERT INTO coverage ({self.keyColumn}, start, end) VALUES (?, ?, ?)",
+            [
+                (key, rangeStart.isoformat(), rangeEnd.isoformat())
+                for rangeStart, rangeEnd in merged
+            ],
+        )
+
+    def _coverage(
+        self, connection: sqlite3.Connection, key: str
+    ) -> List[Tuple[date, date]]:
+        """Reads a key's ranges with the given connection."""
+        rows = connection.execute(
+            f"SELECT start, end FROM coverage WHERE {self.keyColumn} = ? ORDER BY start",
+            (key,),
+        ).fetchall()
+
+        return [
+            (date.fromisoformat(start), date.fromisoformat(end)) for start, end in rows
+        ]
@@ -1,8 +1,14 @@
 import os
 import sys
 from builder.builder import Builder
-from learners import BagLearner, DTLearner, RTLearner, split_time_series
-from json import loads
+from learners import (
+    BagLearner,
+    DTLearner,
+    RTLearner,
+    label_columns,
+    split_time_series,
+    walk_forward,
+)
 from typing import cast
 from sklearn.preprocessing import LabelEncoder
 import pandas as pd
@@ -58,7 +64,11 @@ def create_dataset():
         "[bold bright_yellow]Please enter your desired return threshold[/bold bright_yellow]"
     )
     print("[italic yellow]0.5 -> 0.5%[/italic yellow]")
-    threshold = float(input())
+    print(
+        "[italic yellow]0.5, 1.0 -> separate labels for 0.5% and 1.0%[/italic yellow]"
+    )
+    thresholds = [float(value) for value in input().split(",")]
+    threshold = thresholds[0] if len(thresholds) == 1 else thresholds
 
     splash_screen()
 
@@ -128,6 +138,26 @@ def load_dataset():
         return
 
 
+def select_label(dataset: pd.DataFrame) -> str:
+    """Asks the user which label column to predict when
+    the dataset was built for many thresholds."""
+    labels = label_columns(dataset)
+
+    if len(labels) == 1:
+        return labels[0]
+
+    splash_screen()
+
+    print(
+        "[bold bright_yellow]Please select the label to predict from the menu below:[/bold bright_yellow]"
+    )
+    print()
+    for index, label in enumerate(labels):
+        print(f"[italic yellow]{index + 1} - {label}[/italic yellow]")
+
+    return labels[int(input()) - 1]
+
+
 def train_model():
     """Walks a user through the process of training
     a model."""
@@ -148,10 +178,15 @@ def train_model():
     print("[italic yellow]2 - Random Tree Learners[/italic yellow]")
     selection = int(input())
 
+    label = select_label(dataset)
+
     splash_screen()
 
     print(
-        "[bold bright_yellow]How many learners should be used in the BagLearner?[/bold bright_yellow]"
+        "[bold bright_yellow]What is the maximum number of learners the BagLearner may use?[/bold bright_yellow]"
+    )
+    print(
+        "[italic yellow]Learners stop being added once the out-of-bag accuracy plateaus.[/italic yellow]"
     )
     learner_count = int(input())
 
@@ -160,7 +195,7 @@ def train_model():
     print("[bold bright_yellow]Now training...[/bold bright_yellow]")
 
     encoder = LabelEncoder()
-    dataset["Signal"] = encoder.fit_transform(dataset["Signal"])
+    dataset[label] = encoder.fit_transform(dataset[label])
 
     label_mapping = {
         label: index for index, label in enumerate(cast(np.ndarray, encoder.classes_))
@@ -168,7 +203,7 @@ def train_model():
 
     print(f"[italic yellow]Label Encoder Classes: {label_mapping}[/italic yellow]")
 
-    train_x, train_y, test_x, test_y = split_time_series(dataset)
+    train_x, train_y, test_x, test_y = split_time_series(dataset, target=label)
 
     print(f"[italic yellow]Train Set Length: {len(train_x)}[/italic yellow]")
     print(f"[italic yellow]Test Set Length: {len(test_x)}[/italic yellow]")
@@ -179,16 +214,21 @@ def train_model():
     learner = BagLearner(RTLearner, 50, True)
 
     if selection == 1:
-        learner = BagLearner(DTLearner, learner_count, True)
+        learner = BagLearner(DTLearner, learner_count, True, oob_tolerance=0.001)
     else:
-        learner = BagLearner(RTLearner, learner_count, True)
+        learner = BagLearner(RTLearner, learner_count, True, oob_tolerance=0.001)
 
     learner.add_evidence(train_x, train_y)
 
+    oob_accuracy, oob_f1 = learner.generate_oob_stats()
+
     print("[bold bright_green]Training Complete![/bold bright_green]")
+    print(f"[italic yellow]Learners Used: {len(learner.learners)}[/italic yellow]")
+    print(f"[italic yellow]Out-of-Bag Accuracy: {oob_accuracy}[/italic yellow]")
+    print(f"[italic yellow]Out-of-Bag F1 Score: {oob_f1}[/italic yellow]")
     print("[bold bright_yellow]Now testing...[/bold bright_yellow]")
 
-    y_pred = learner.query(loads(cast(str, test_x.to_json(orient="records"))))
+    y_pred = learner.query(test_x)
 
     accuracy, precision, f1, recall, confusion = learner.generate_classification_stats(
         test_y, y_pred
@@ -216,49 +256,157 @@ def train_model():
     plt.show()
     input()
 
+    splash_screen()
 
-error = ""
+    print(
+        "[bold bright_yellow]Please enter a path to save your model, or leave blank to skip.[/bold bright_yellow]"
+    )
+    save_path = input()
 
-while True:
-    splash_screen()
+    if save_path != "":
+        if not save_path.endswith(".npz"):
+            save_path = f"{save_path}.npz"
 
-    if DATASET_LOADED:
+        learner.save(save_path)
+
+        print(
+            f"[bold bright_yellow]Your model has been saved at {save_path}[/bold bright_yellow]"
+        )
         print(
-            f"[bold bright_green]Loaded Dataset: {len(DATASET)} rows[/bold bright_green]"
+            "[bold bright_yellow]Please press any key to return to the main menu[/bold bright_yellow]"
         )
+        input()
+
+
+def backtest_model():
+    """Walks a user through the process of evaluating
+    a model over walk-forward folds of the dataset."""
+    global DATASET
+    global DATASET_LOADED
+
+    splash_screen()
+
+    if not DATASET_LOADED:
+        print("[bold red]A dataset must be loaded to backtest a model.[/bold red]")
+        return
+
+    dataset = DATASET.copy()
 
     print("[bold bright_yellow]Please select from the menu below:[/bold bright_yellow]")
     print()
+    print("[italic yellow]1 - Decision Tree Learners[/italic yellow]")
+    print("[italic yellow]2 - Random Tree Learners[/italic yellow]")
+    selection = int(input())
 
-    if error != "":
-        print(f"[bold red]{error}[/bold red]")
-        print()
-        error = ""
+    label = select_label(dataset)
 
-    print("[italic yellow]1 - Create a Dataset[/italic yellow]")
-    print("[italic yellow]2 - Load a Dataset[/italic yellow]")
-    print("[italic yellow]3 - Train and Test a Model[/italic yellow]")
-    print("[italic red]q - Quit[/italic red]")
+    splash_screen()
 
-    selection = 0
+    print(
+        "[bold bright_yellow]How many learners should be used in each fold's BagLearner?[/bold bright_yellow]"
+    )
+    learner_count = int(input())
 
-    try:
-        raw_response = input()
+    splash_screen()
+
+    error = ""
 
-        if raw_response.upper() == "Q":
+    while True:
+        if error != "":
+            print(f"[bold red]{error}[/bold red]")
+            print()
+            error = ""
+
+        print(
+            "[bold bright_yellow]How many folds should be tested?[/bold bright_yellow]"
+        )
+        fold_count = int(input())
+
+        splash_screen()
+
+        # Every fold needs at least one test row, and the first one a training row
+        if 1 <= fold_count < len(dataset):
             break
 
-        selection = int(raw_response)
-        if selection > 3 or selection < 1:
-            error = "Your selection was invalid."
+        error = f"The number of folds must be between 1 and {len(dataset) - 1}."
+
+    print("[bold bright_yellow]Now backtesting...[/bold bright_yellow]")
+
+    encoder = LabelEncoder()
+    dataset[label] = encoder.fit_transform(dataset[label])
+
+    # Expanding training sets, with the last fold_count test windows
+    # covering the end of the dataset
+    test_size = len(dataset) // (fold_count + 1)
+    train_size = len(dataset) - fold_count * test_size
+
+    results = walk_forward(
+        dataset,
+        DTLearner if selection == 1 else RTLearner,
+        learner_count,
+        train_size,
+        test_size,
+        target=label,
+        n_jobs=None,
+    )
+
+    print("[bold bright_green]Backtesting Complete![/bold bright_green]")
+    print("[italic green]Fold Results[/italic green]")
+    print(results)
+    print(
+        "[bold bright_yellow]Please press any key to return to the main menu[/bold bright_yellow]"
+    )
+    input()
+
+
+if __name__ == "__main__":
+    error = ""
+
+    while True:
+        splash_screen()
+
+        if DATASET_LOADED:
+            print(
+                f"[bold bright_green]Loaded Dataset: {len(DATASET)} rows[/bold bright_green]"
+            )
+
+        print(
+            "[bold bright_yellow]Please select from the menu below:[/bold bright_yellow]"
+        )
+        print()
+
+        if error != "":
+            print(f"[bold red]{error}[/bold red]")
+            print()
+            error = ""
+
+        print("[italic yellow]1 - Create a Dataset[/italic yellow]")
+        print("[italic yellow]2 - Load a Dataset[/italic yellow]")
+        print("[italic yellow]3 - Train and Test a Model[/italic yellow]")
+        print("[italic yellow]4 - Walk-Forward Backtest a Model[/italic yellow]")
+        print("[italic red]q - Quit[/italic red]")
+
+        selection = 0
+
+        try:
+            raw_response = input()
+
+            if raw_response.upper() == "Q":
+                break
+
+            selection = int(raw_response)
+            if selection > 4 or selection < 1:
+                error = "Your selection was invalid."
+                continue
+        except:
+            error = "Your selection must be a valid integer."
             continue
-    except:
-        error = "Your selection must be a valid integer."
-        continue
 
-    if selection == 1:
-        create_dataset()
-    elif selection == 2:
-        load_dataset()
-    elif selection == 3:
-        train_model()
+        if selection == 1:
+            create_dataset()
+        elif selection == 2:
+            load_dataset()
+        elif selection == 3:
+            train_model()
+        elif selection == 4:
+            backtest_model()
@@ -1 +1,4 @@
-from .stooq import Stooq
+from .stooq import Stooq, StooqError
+from .cache import PriceCache
+from .session import RateLimitedSession
+from .symbols import SymbolIndex
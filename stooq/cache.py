@@ -0,0 +1,134 @@
+from contextlib import closing
+from datetime import date
+import pandas as pd
+from localcache import CoverageCache
+
+
+class PriceCache(CoverageCache):
+    keyColumn = "symbol"
+
+    def __init__(self, path: str | None = None):
+        """Opens (creating if needed) an SQLite cache of daily bars, keyed by
+        resolved Stooq symbol. Alongside the bars, it records which date ranges
+        have been fetched, so ranges without trading days aren't fetched again,
+        and which symbol each ticker resolved to.
+
+        Args:
+            path (str | None): Path of the SQLite file, defaults to prices.sqlite in CACHE_DIR.
+
+        Returns:
+            None
+        """
+        super().__init__(
+            path,
+            "prices.sqlite",
+            """
+            CREATE TABLE IF NOT EXISTS bars (
+                symbol TEXT NOT NULL,
+                date TEXT NOT NULL,
+                open REAL,
+                high REAL,
+                low REAL,
+                close REAL,
+                volume INTEGER,
+                PRIMARY KEY (symbol, date)
+            );
+            CREATE TABLE IF NOT EXISTS symbols (
+                ticker TEXT PRIMARY KEY,
+                symbol TEXT NOT NULL
+            );
+            """,
+        )
+
+    def resolve(self, ticker: str) -> str | None:
+        """Looks up the symbol a ticker resolved to, such as AAPL -> AAPL.US.
+
+        Args:
+            ticker (str): The ticker as requested.
+
+        Returns:
+            str | None: The resolved symbol, None if the ticker was never resolved.
+        """
+        with closing(self.connect()) as connection:
+            row = connection.execute(
+                "SELECT symbol FROM symbols WHERE ticker = ?", (ticker.upper(),)
+            ).fetchone()
+
+        return row[0] if row else None
+
+    def setResolved(self, ticker: str, symbol: str) -> None:
+        """Records the symbol a ticker resolved to.
+
+        Args:
+            ticker (str): The ticker as requested.
+            symbol (str): The symbol Stooq returned data for.
+
+        Returns:
+            None
+        """
+        with closing(self.connect()) as connection, connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO symbols (ticker, symbol) VALUES (?, ?)",
+                (ticker.upper(), symbol),
+            )
+
+    def store(
+        self, symbol: str, stockDF: pd.DataFrame, startDate: date, endDate: date
+    ) -> None:
+        """Saves the bars fetched for a date range and marks the range as fetched.
+
+        Args:
+            symbol (str): The resolved symbol.
+            stockDF (pd.DataFrame): The bars, as returned by Stooq.download.
+            startDate (date): First day of the fetched range.
+            endDate (date): End of the fetched range, the day after its last day.
+
+        Returns:
+            None
+        """
+        bars = [
+            (
+                symbol,
+                day.strftime("%Y-%m-%d"),
+                float(row.Open),
+                float(row.High),
+                float(row.Low),
+                float(row.Close),
+                int(row.Volume),
+            )
+            for day, row in zip(stockDF.index, stockDF.itertuples())
+        ]
+
+        with self.transaction() as connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO bars VALUES (?, ?, ?, ?, ?, ?, ?)", bars
+            )
+            self.markCovered(connection, symbol, startDate, endDate)
+
+    def load(self, symbol: str, startDate: date, endDate: date) -> pd.DataFrame:
+        """Reads the cached bars of a date range.
+
+        Args:
+            symbol (str): The resolved symbol.
+            startDate (date): First day of the range.
+            endDate (date): End of the range, the day after its last day.
+
+        Returns:
+            pd.DataFrame: The bars, shaped like Stooq.download's result.
+        """
+        with closing(self.connect()) as connection:
+            df = pd.read_sql_query(
+                "SELECT date AS Date, open AS Open, high AS High, low AS Low,"
+                " close AS Close, volume AS Volume FROM bars"
+                " WHERE symbol = ? AND date >= ? AND date < ? ORDER BY date",
+                connection,
+                params=(symbol, startDate.isoformat(), endDate.isoformat()),
+            )
+
+        df = df.set_index("Date")
+
+        df.index = pd.to_datetime(df.index, format="%Y-%m-%d")
+
+        df["Volume"] = df["Volume"].astype("int64")
+
+        return df
@@ -0,0 +1,41 @@
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class RateLimitedSession(requests.Session):
+    def __init__(self, rateLimit: float | None = None, poolSize: int = 10):
+        """A requests session that reuses up to poolSize connections per host
+        and, across all threads sharing it, starts at most rateLimit requests
+        per second.
+
+        Args:
+            rateLimit (float | None): Maximum requests per second, None for no limit.
+            poolSize (int): Number of connections kept open per host, defaults to 10.
+
+        Returns:
+            None
+        """
+        super().__init__()
+
+        adapter = HTTPAdapter(pool_connections=poolSize, pool_maxsize=poolSize)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+        self.interval = 1 / rateLimit if rateLimit else 0.0
+        self.nextRequest = time.monotonic()
+        self.lock = threading.Lock()
+
+    def request(self, *args, **kwargs) -> requests.Response:
+        """Waits for the next free request slot, then sends the request."""
+        if self.interval:
+            with self.lock:
+                now = time.monotonic()
+                wait = self.nextRequest - now
+                self.nextRequest = max(now, self.nextRequest) + self.interval
+
+            if wait > 0:
+                time.sleep(wait)
+
+        return super().request(*args, **kwargs)
@@ -1,28 +1,68 @@
+import io
 import re
 import time
-from typing import List
+from datetime import datetime, timedelta
+from multiprocessing.pool import ThreadPool
+from typing import Dict, List, Tuple
 import requests
 import pandas as pd
+from .cache import PriceCache
+from .session import RateLimitedSession
+from .symbols import SymbolIndex
+
+# Column types of Stooq's daily CSV, Volume is sometimes written as a float
+PRICE_SCHEMA = {
+    "Open": "float64",
+    "High": "float64",
+    "Low": "float64",
+    "Close": "float64",
+    "Volume": "float64",
+}
+
+# Number of index matches that answers a ticker query without asking Stooq
+INDEX_MATCHES = 10
+
+# Body Stooq answers with when a symbol has no data in the requested range
+NO_DATA = "No data"
+
+
+class StooqError(RuntimeError):
+    """Raised when Stooq answers a price request with something other than price data."""
 
 
 class Stooq:
+    # Symbols that tickers resolved to during this run, example: AAPL -> AAPL.US
+    resolvedSymbols: Dict[str, str] = {}
+
     def __init__(self):
         pass
 
     @staticmethod
-    def queryTicker(ticker: str) -> List[object]:
+    def queryTicker(ticker: str, index: SymbolIndex | None = None) -> List[object]:
         """Queries Stooq for tickers that are related
         to the given ticker. Returns available tickers to the user.
 
         Args:
             ticker (str): Ticker to search for
+            index (SymbolIndex | None): If given, the index is searched by prefix first, and
+            Stooq is only skipped when the index holds the ticker itself or INDEX_MATCHES
+            stocks matching it. Otherwise Stooq's results are added to the index and
+            followed by the index's other matches. Stocks found only in the index
+            have no quote, their Price and Daily_Increase are None.
 
         Returns:
             List[object]: List of objects for each found ticker,
             including full ticker name, full company name, exchange,
-            price, and daily increase.
+            price, and daily increase (None for stocks found in the index).
         """
 
+        indexed = []
+
+        if index is not None:
+            indexed = index.prefix(ticker, INDEX_MATCHES)
+            if index.get(ticker) is not None or len(indexed) >= INDEX_MATCHES:
+                return indexed
+
         current_epoch = int(time.time())
 
         request_url = f"https://stooq.com/cmp/?{current_epoch}&q={ticker}"
@@ -59,69 +99,212 @@ class Stooq:
                 }
             )
 
-        return stocks
+        if index is not None and len(stocks) > 0:
+            index.add(stocks)
+
+        tickers = {stock["Ticker"].upper() for stock in stocks}
+
+        return stocks + [
+            stock for stock in indexed if stock["Ticker"].upper() not in tickers
+        ]
 
     @staticmethod
-    def download(ticker: str, startDate: str, endDate: str) -> pd.DataFrame:
+    def download(
+        ticker: str,
+        startDate: str,
+        endDate: str,
+        cache: PriceCache | None = None,
+        session: requests.Session | None = None,
+    ) -> pd.DataFrame:
         """Downloads historical data for a given ticker during a
         given period of time. Returns a pandas DataFrame representing
-        the data.
+        the data. If no data is found for a bare ticker, it is retried
+        as a US ticker, example: AAPL -> AAPL.US.
 
         Args:
             ticker (str): Exact ticker to pull historical data for.
             startDate (str): Date for historical data to begin, example:
             20231012 -> October 12, 2023.
             endDate (str): Date for historical data to end. Same format as startDate.
+            cache (PriceCache | None): If given, bars are read from the cache, and
+            only date ranges missing from it are downloaded and added to it. A range
+            whose request fails with a StooqError is left missing, to be retried.
+            session (requests.Session | None): Session to send requests with, if given.
 
         Returns:
             pandas.DataFrame: DataFrame representing the stock's historical data.
             Includes columns for date, open, close, high, low, and volume.
         """
-        request_url = (
-            f"https://stooq.com/q/d/l/?s={ticker}&d1={startDate}&d2={endDate}&i=d"
-        )
+        if cache is None:
+            return Stooq.fetchResolving(ticker, startDate, endDate, session)[1]
+
+        # Stooq's endDate is inclusive, the cache's ranges end the day after their last day
+        start_date = datetime.strptime(startDate, "%Y%m%d").date()
+        end_date = datetime.strptime(endDate, "%Y%m%d").date() + timedelta(days=1)
+
+        symbol = cache.resolve(ticker)
+
+        if symbol is None:
+            symbol, df = Stooq.fetchResolving(ticker, startDate, endDate, session)
+
+            # Nothing is cached until the ticker resolves to a symbol with data
+            if len(df) == 0:
+                return df
+
+            cache.setResolved(ticker, symbol)
+            cache.store(symbol, df, start_date, end_date)
+        else:
+            for missing_start, missing_end in cache.missingRanges(
+                symbol, start_date, end_date
+            ):
+                df = Stooq.fetch(
+                    symbol,
+                    missing_start.strftime("%Y%m%d"),
+                    (missing_end - timedelta(days=1)).strftime("%Y%m%d"),
+                    session,
+                )
+                cache.store(symbol, df, missing_start, missing_end)
+
+        return cache.load(symbol, start_date, end_date)
 
-        response = requests.get(request_url)
+    @staticmethod
+    def downloadMany(
+        tickers: List[str],
+        startDate: str,
+        endDate: str,
+        threads: int = 16,
+        rateLimit: float | None = 10.0,
+        cache: PriceCache | None = None,
+    ) -> Dict[str, pd.DataFrame]:
+        """Downloads historical data for many tickers concurrently, sharing
+        one pooled, rate limited session. See download for the details of
+        each ticker's download.
 
-        df = pd.DataFrame(
-            columns=pd.Index(["Date", "Open", "High", "Low", "Close", "Volume"])
-        )
+        Args:
+            tickers (List[str]): Tickers to pull historical data for.
+            startDate (str): Date for historical data to begin, example:
+            20231012 -> October 12, 2023.
+            endDate (str): Date for historical data to end. Same format as startDate.
+            threads (int): Number of tickers downloaded at once, defaults to 16.
+            rateLimit (float | None): Maximum requests per second across all
+            threads, defaults to 10. None for no limit.
+            cache (PriceCache | None): If given, bars are read from and added to the cache.
 
-        res_body = response.text
+        Returns:
+            Dict[str, pandas.DataFrame]: Each ticker's historical data, empty for
+            tickers without data.
+        """
+        tickers = list(dict.fromkeys(tickers))
+
+        with RateLimitedSession(rateLimit, poolSize=threads) as session:
+            pool = ThreadPool(threads)
+            try:
+                results = pool.map(
+                    lambda ticker: Stooq.download(
+                        ticker, startDate, endDate, cache, session
+                    ),
+                    tickers,
+                )
+            finally:
+                pool.close()
+                pool.join()
+
+        return dict(zip(tickers, results))
+
+    @staticmethod
+    def fetchResolving(
+        ticker: str,
+        startDate: str,
+        endDate: str,
+        session: requests.Session | None = None,
+    ) -> Tuple[str, pd.DataFrame]:
+        """Downloads historical data for a ticker, retrying it as a US
+        ticker if nothing is found. Tickers resolved earlier in the run
+        are fetched as their resolved symbol directly.
 
-        rows = res_body.split("\n")
+        Args:
+            ticker (str): Exact ticker to pull historical data for.
+            startDate (str): Date for historical data to begin, example:
+            20231012 -> October 12, 2023.
+            endDate (str): Date for historical data to end. Same format as startDate.
+            session (requests.Session | None): Session to send requests with, if given.
+
+        Returns:
+            Tuple[str, pandas.DataFrame]: The symbol the data was found for, and the data.
+        """
+        resolved = Stooq.resolvedSymbols.get(ticker.upper())
+        if resolved is not None:
+            return resolved, Stooq.fetch(resolved, startDate, endDate, session)
+
+        symbol = ticker
+        df = Stooq.fetch(symbol, startDate, endDate, session)
 
-        rows = rows[1:]
+        if len(df) == 0 and ".US" not in ticker.upper():
+            symbol = f"{ticker}.US"
+            df = Stooq.fetch(symbol, startDate, endDate, session)
 
-        data = {
-            "Date": [],
-            "Open": [],
-            "High": [],
-            "Low": [],
-            "Close": [],
-            "Volume": [],
-        }
+        if len(df) > 0:
+            Stooq.resolvedSymbols[ticker.upper()] = symbol
 
-        for row in rows:
-            params = row.split(",")
+        return symbol, df
 
-            if len(params) < 6:
-                continue
+    @staticmethod
+    def fetch(
+        symbol: str,
+        startDate: str,
+        endDate: str,
+        session: requests.Session | None = None,
+    ) -> pd.DataFrame:
+        """Downloads historical data for an exact Stooq symbol.
 
-            data["Date"].append(params[0].strip())
-            data["Open"].append(float(params[1].strip()))
-            data["High"].append(float(params[2].strip()))
-            data["Low"].append(float(params[3].strip()))
-            data["Close"].append(float(params[4].strip()))
-            data["Volume"].append(int(float(params[5].strip())))
+        Args:
+            symbol (str): Exact symbol to pull historical data for.
+            startDate (str): Date for historical data to begin, example:
+            20231012 -> October 12, 2023.
+            endDate (str): Date for historical data to end. Same format as startDate.
+            session (requests.Session | None): Session to send the request with, if given.
 
-        df = pd.DataFrame(data)
+        Returns:
+            pandas.DataFrame: DataFrame representing the stock's historical data,
+            empty when Stooq has no data for the symbol. StooqError is raised for
+            any other answer that isn't price data, so it is never taken as empty.
+        """
+        request_url = (
+            f"https://stooq.com/q/d/l/?s={symbol}&d1={startDate}&d2={endDate}&i=d"
+        )
 
-        df = df.set_index("Date")
+        response = (session or requests).get(request_url)
 
-        df.index = pd.to_datetime(df.index, format="%Y-%m-%d")
+        if response.status_code != 200:
+            raise StooqError(
+                f"Stooq answered {symbol} with status {response.status_code}."
+            )
 
-        if len(df) == 0 and ".US" not in ticker.upper():
-            return Stooq.download(f"{ticker}.US", startDate, endDate)
+        # Stooq answers unknown symbols, and ranges without bars, with a plain "No data" body
+        if response.text.strip() == NO_DATA:
+            return pd.DataFrame(
+                {
+                    column: pd.Series(dtype=dtype)
+                    for column, dtype in PRICE_SCHEMA.items()
+                },
+                index=pd.DatetimeIndex([], name="Date"),
+            ).astype({"Volume": "int64"})
+
+        try:
+            df = pd.read_csv(
+                io.BytesIO(response.content),
+                usecols=["Date", *PRICE_SCHEMA],
+                dtype=PRICE_SCHEMA,
+                index_col="Date",
+                parse_dates=["Date"],
+                date_format="%Y-%m-%d",
+            )
+            df["Volume"] = df["Volume"].astype("int64")
+        except ValueError as error:
+            # Such as the daily hits limit page, or a body cut short
+            raise StooqError(
+                f"Stooq answered {symbol} with a body that isn't price data:"
+                f" {response.text[:100]!r}"
+            ) from error
 
         return df
@@ -0,0 +1,192 @@
+import difflib
+import json
+import os
+from bisect import bisect_left
+from typing import Dict, List
+import pandas as pd
+from localcache import cachePath
+
+
+class SymbolIndex:
+    def __init__(self, path: str | None = None):
+        """Opens a locally saved index of Stooq symbols, built from past
+        queryTicker results or imported symbol lists, for offline prefix
+        and fuzzy search over tickers and company names. Stocks are shaped
+        like queryTicker's results, but quotes go stale, so the index keeps
+        none and Price and Daily_Increase are always None.
+
+        Args:
+            path (str | None): Path of the JSON file, defaults to symbols.json in CACHE_DIR.
+
+        Returns:
+            None
+        """
+        self.path = cachePath("symbols.json") if path is None else path
+        self.stocks: Dict[str, dict] = {}
+
+        if os.path.exists(self.path):
+            with open(self.path) as file:
+                for stock in json.load(file):
+                    self.stocks[stock["Ticker"].upper()] = SymbolIndex._entry(stock)
+
+        self.reindex()
+
+    def __len__(self) -> int:
+        return len(self.stocks)
+
+    def reindex(self) -> None:
+        """Rebuilds the sorted ticker and name arrays used for searching."""
+        self.tickerKeys = sorted(self.stocks)
+
+        names = sorted(
+            (stock["Name"].upper(), key)
+            for key, stock in self.stocks.items()
+            if stock.get("Name")
+        )
+        self.nameKeys = [name for name, _ in names]
+        self.nameTickers = [key for _, key in names]
+
+    def save(self) -> None:
+        """Writes the index to its JSON file."""
+        with open(self.path, "w") as file:
+            json.dump(list(self.stocks.values()), file)
+
+    def add(self, stocks: List[dict]) -> None:
+        """Adds or replaces stocks, shaped like queryTicker's results, and saves the index.
+
+        Args:
+            stocks (List[dict]): Stocks with at least a Ticker key.
+
+        Returns:
+            None
+        """
+        for stock in stocks:
+            self.stocks[stock["Ticker"].upper()] = SymbolIndex._entry(stock)
+
+        self.reindex()
+        self.save()
+
+    @staticmethod
+    def _entry(stock: dict) -> dict:
+        """Keeps a stock's ticker, name and exchange, without its quote."""
+        return {
+            "Ticker": stock["Ticker"],
+            "Name": stock.get("Name") or "",
+            "Exchange": stock.get("Exchange") or "",
+            "Price": None,
+            "Daily_Increase": None,
+        }
+
+    def importSymbols(self, path: str) -> int:
+        """Adds a symbol list from a CSV file with a Ticker column and,
+        optionally, Name and Exchange columns.
+
+        Args:
+            path (str): Path of the CSV file.
+
+        Returns:
+            int: Number of symbols imported.
+        """
+        symbols = pd.read_csv(path, dtype=str).fillna("")
+
+        if "Ticker" not in symbols.columns:
+            raise ValueError(f"Symbol list {path} has no Ticker column.")
+
+        stocks = [
+            {
+                "Ticker": row["Ticker"],
+                "Name": row.get("Name", ""),
+                "Exchange": row.get("Exchange", ""),
+            }
+            for row in symbols.to_dict("records")
+            if row["Ticker"]
+        ]
+
+        self.add(stocks)
+
+        return len(stocks)
+
+    def get(self, ticker: str) -> dict | None:
+        """Looks up a ticker exactly, also trying it as a US ticker,
+        example: AAPL -> AAPL.US.
+
+        Args:
+            ticker (str): Ticker to look up.
+
+        Returns:
+            dict | None: The stock, None if the ticker isn't in the index.
+        """
+        key = ticker.upper()
+        stock = self.stocks.get(key) or self.stocks.get(f"{key}.US")
+        return dict(stock) if stock else None
+
+    def prefix(self, query: str, limit: int = 10) -> List[dict]:
+        """Finds stocks whose ticker or company name starts with the query.
+
+        Args:
+            query (str): Start of a ticker or company name, case insensitive.
+            limit (int): Maximum number of stocks to return, defaults to 10.
+
+        Returns:
+            List[dict]: Matching stocks, ticker matches first.
+        """
+        query = query.upper()
+        found: List[str] = []
+
+        for keys, tickers in [
+            (self.tickerKeys, self.tickerKeys),
+            (self.nameKeys, self.nameTickers),
+        ]:
+            i = bisect_left(keys, query)
+            while i < len(keys) and keys[i].startswith(query) and len(found) < limit:
+                if tickers[i] not in found:
+                    found.append(tickers[i])
+                i += 1
+
+        return [dict(self.stocks[key]) for key in found]
+
+    def fuzzy(self, query: str, limit: int = 10, cutoff: float = 0.6) -> List[dict]:
+        """Finds stocks whose ticker or company name is similar to the query.
+
+        Args:
+            query (str): Ticker or company name, possibly misspelled, case insensitive.
+            limit (int): Maximum number of stocks to return, defaults to 10.
+            cutoff (float): Minimum similarity in [0, 1], defaults to 0.6.
+
+        Returns:
+            List[dict]: Matching stocks, most similar first.
+        """
+        names = dict(zip(self.nameKeys, self.nameTickers))
+        matches = difflib.get_close_matches(
+            query.upper(), self.tickerKeys + self.nameKeys, n=limit, cutoff=cutoff
+        )
+
+        found: List[str] = []
+        for match in matches:
+            key = match if match in self.stocks else names[match]
+            if key not in found:
+                found.append(key)
+
+        return [dict(self.stocks[key]) for key in found]
+
+    def search(self, query: str, limit: int = 10) -> List[dict]:
+        """Finds stocks by prefix, filling any remaining places with fuzzy matches.
+
+        Args:
+            query (str): Ticker or company name to search for.
+            limit (int): Maximum number of stocks to return, defaults to 10.
+
+        Returns:
+            List[dict]: Matching stocks.
+        """
+        stocks = self.prefix(query, limit)
+
+        if len(stocks) < limit:
+            tickers = {stock["Ticker"] for stock in stocks}
+            stocks += [
+                stock
+                for stock in self.fuzzy(query, limit)
+                if stock["Ticker"] not in tickers
+            ][: limit - len(stocks)]
+
+        return stocks